@@ -7,14 +7,19 @@
 import sys
 import os
 import argparse
+import time
+import concurrent.futures
+import itertools
+import multiprocessing
 from typing import Optional
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from video_processor import VideoProcessor, create_output_directory, validate_time_format
-from main_gui import VideoFrameExtractorGUI
-from utils import is_video_file, get_file_size_mb, format_file_size
+# video_processor 依赖 OpenCV 等较重的库，仅在命令行模式下导入，GUI 启动时由界面在后台加载
+from utils import (
+    is_video_filename, get_file_size_mb, format_file_size, get_available_cpus, pin_current_thread
+)
 
 
 def print_banner():
@@ -26,7 +31,7 @@ def print_banner():
 ╠══════════════════════════════════════════════════════════════╣
 ║  功能: 将视频转换为时间命名的图片序列                              ║
 ║  支持: 多种视频格式，自定义时间范围和帧间隔                         ║
-║  输出: HH-MM-SS-ms.png 格式的图片文件                           ║
+║  输出: HH-MM-SS-ms.<扩展名> 格式的图片，扩展名随 --format 而定  ║
 ╠══════════════════════════════════════════════════════════════╣
 ║  作者：Lun.   githun:Lun-OS   QQ:15965342218                  ║
 ╚══════════════════════════════════════════════════════════════╝
@@ -41,6 +46,7 @@ def print_help():
   python main.py                           # 启动GUI界面
   python main.py [视频文件]                 # 使用默认参数提取
   python main.py [视频文件] [选项]          # 使用自定义参数提取
+  python main.py [视频1] [视频2] ... [选项]  # 多个视频并行提取
 
 选项:
   -h, --help                              显示此帮助信息
@@ -48,14 +54,29 @@ def print_help():
   -s, --start TIME                        开始时间 (格式: HH:MM:SS, 默认: 00:00:00)
   -e, --end TIME                          结束时间 (格式: HH:MM:SS, 默认: 视频结尾)
   -i, --interval N                        帧间隔 (每隔N帧提取一帧, 默认: 1)
+  -f, --format FMT                        输出格式 png/jpg/webp (默认: jpg)
+  -q, --quality N                         JPEG/WebP 质量 1-100 (默认: JPEG 92)
+  --png-level N                           PNG 压缩等级 0-9 (默认: 1，最快)
+  --preset NAME                           编码质量预设 fast/balanced/archive (覆盖 -q 与 --png-level)
+  --backend NAME                          解码后端 auto/pyav/ffmpeg/opencv/decord (默认: auto)
+  --gpu-decode                            使用 NVDEC 硬件解码 (需安装 ffmpegcv 与 NVIDIA 显卡)
+  --ffmpeg-mux                            解码后的原始帧经管道交给 ffmpeg 编码输出 (需安装 FFmpeg)
+  --keyframes-only                        只提取关键帧，-i 作用于关键帧序列 (需安装 PyAV 或 FFmpeg)
+  --encode-processes                      PNG/无损 WebP 使用多进程编码 (帧经共享内存传递)
+  --threadpool-scaling X                  按输出格式算出的编码线程数再乘以 X (默认: 1.0)
+  --resize WxH                            输出尺寸，如 1280x720 (由解码器在色彩转换时完成缩放)
   --gui                                   强制启动GUI界面
   --no-gui                                强制使用命令行模式
+  --quiet                                 不显示启动横幅
+  --pin-cpus                              解码与编码线程绑定到不同 CPU 核心 (仅 Linux)
 
 示例:
   python main.py video.mp4                                    # 提取整个视频的所有帧
   python main.py video.mp4 -s 00:01:00 -e 00:02:00          # 提取1-2分钟的帧
   python main.py video.mp4 -i 30                             # 每隔30帧提取一帧
   python main.py video.mp4 -o ./output -s 00:00:30 -i 10    # 自定义输出目录和参数
+  python main.py video.mp4 -f webp                           # 导出为无损 WebP
+  python main.py a.mp4 b.mp4 c.mp4 -o ./output               # 多个视频并行提取到各自子目录
 
 支持的视频格式:
   .mp4, .avi, .mov, .mkv, .wmv, .flv, .webm, .m4v, .3gp, .mpg, .mpeg, .ts
@@ -63,6 +84,33 @@ def print_help():
     print(help_text)
 
 
+def parse_resize(value: str) -> tuple[int, int]:
+    """
+    解析 WxH 形式的尺寸参数
+    
+    Returns:
+        (宽, 高)
+    """
+    try:
+        w, h = value.lower().split('x')
+        size = (int(w), int(h))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"尺寸格式错误: {value} (应为 WxH，如 1280x720)")
+    if size[0] <= 0 or size[1] <= 0:
+        raise argparse.ArgumentTypeError(f"尺寸必须大于0: {value}")
+    return size
+
+
+def _make_pinner(cpus: list[int]):
+    """创建线程池 initializer：每个新线程依次绑定到 cpus 中的下一个核心"""
+    worker_index = itertools.count()
+    
+    def initializer():
+        pin_current_thread({cpus[next(worker_index) % len(cpus)]})
+    
+    return initializer
+
+
 def validate_arguments(args) -> tuple[bool, str]:
     """
     验证命令行参数
@@ -70,11 +118,13 @@ def validate_arguments(args) -> tuple[bool, str]:
     Returns:
         (是否有效, 错误信息)
     """
+    from video_processor import validate_time_format
+    
     # 检查视频文件
     if not os.path.isfile(args.video):
         return False, f"视频文件不存在: {args.video}"
     
-    if not is_video_file(args.video):
+    if not is_video_filename(args.video):
         return False, f"不支持的视频格式: {args.video}"
     
     # 检查时间格式
@@ -88,6 +138,18 @@ def validate_arguments(args) -> tuple[bool, str]:
     if args.interval < 1:
         return False, f"帧间隔必须大于0: {args.interval}"
     
+    # 检查 PNG 压缩等级
+    if not (0 <= args.png_level <= 9):
+        return False, f"PNG 压缩等级必须在 0-9 之间: {args.png_level}"
+    
+    # 检查输出质量
+    if args.quality is not None and not (1 <= args.quality <= 100):
+        return False, f"输出质量必须在 1-100 之间: {args.quality}"
+    
+    # 检查编码线程数系数
+    if args.threadpool_scaling <= 0:
+        return False, f"编码线程数系数必须大于0: {args.threadpool_scaling}"
+    
     return True, ""
 
 
@@ -98,6 +160,8 @@ def extract_frames_cli(args) -> bool:
     Returns:
         是否成功
     """
+    from video_processor import VideoProcessor, create_output_directory, QUALITY_PRESETS
+    
     try:
         print(f"正在加载视频: {args.video}")
         
@@ -132,24 +196,85 @@ def extract_frames_cli(args) -> bool:
         
         estimated_frames = len(range(start_frame, end_frame + 1, args.interval))
         print(f"预计提取帧数: {estimated_frames}")
+        
+        # 输出格式：JPEG 默认质量 92，编码远快于 PNG 且体积更小
+        output_format = 'jpeg' if args.format in ('jpg', 'jpeg') else args.format
+        quality = args.quality
+        if quality is None and output_format == 'jpeg':
+            quality = 92
+        print(f"输出格式: {output_format.upper()}")
         print()
         
-        # 进度回调函数
+        # 进度回调函数：按时间节流到每秒约 10 次，避免逐帧输出成为瓶颈
+        last_report = [0.0]
+        processes = getattr(args, 'processes', 1)
+        
         def progress_callback(current, total, frame_path):
+            if processes > 1:
+                # 多进程并行时各进程的进度行会相互覆盖，只输出最终结果
+                return
+            now = time.monotonic()
+            if now - last_report[0] < 0.1 and current < total:
+                return
+            last_report[0] = now
             progress = (current / total) * 100
             filename = os.path.basename(frame_path)
-            print(f"\r进度: {current}/{total} ({progress:.1f}%) - {filename}", end="", flush=True)
+            sys.stdout.write(f"\r进度: {current}/{total} ({progress:.1f}%) - {filename}")
+            sys.stdout.flush()
         
         print("开始提取帧...")
         
-        # 执行提取
-        result = processor.extract_frames(
-            output_dir=output_dir,
-            start_time=args.start,
-            end_time=args.end,
-            frame_interval=args.interval,
-            progress_callback=progress_callback
+        # 可选的 CPU 绑定：解码（当前线程及其创建的写盘线程）固定在第一个核心，
+        # 编码线程轮流绑定到其余核心，减少线程在核心间迁移造成的缓存失效。
+        # 仅在使用写盘线程池的 OpenCV/decord/NVDEC 路径绑定：ffmpeg 子进程与
+        # PyAV 解码线程会继承调用线程的单核掩码，绑定后反而只能在一个核心上运行。
+        # 多个视频并行处理时各进程读到相同的 CPU 列表，会把解码线程都绑到同一核心，因此不绑定
+        encode_processes = getattr(args, 'encode_processes', False)
+        chosen_backend = processor.resolve_backend('nvdec' if args.gpu_decode else args.backend,
+                                                   args.keyframes_only)
+        uses_save_pool = (chosen_backend in ('opencv', 'decord', 'nvdec') and not encode_processes
+                          and not (args.ffmpeg_mux and processor._ffmpeg_available()))
+        cpus = get_available_cpus()
+        pinned = (args.pin_cpus and uses_save_pool and processes == 1 and len(cpus) > 1
+                  and pin_current_thread({cpus[0]}))
+        initializer = _make_pinner(cpus[1:]) if pinned else None
+        
+        # 解码与编码写盘重叠：写盘线程池由 CLI 创建并传入，提取结束后统一等待完成
+        # 线程数与 extract_frames 的默认规则一致（按输出格式确定，PIL 编码的 WebP 最多 4 线程）；
+        # 多个视频并行处理时，各进程平分这些线程，避免线程总数远超核心数
+        # 多进程编码时不传线程池，由 extract_frames 创建编码进程池
+        webp_method = QUALITY_PRESETS[args.preset]['webp_method'] if args.preset else 4
+        encode_workers = VideoProcessor._default_encode_workers(output_format, webp_method, args.threadpool_scaling)
+        save_pool = None if encode_processes else concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, encode_workers // processes),
+            initializer=initializer
         )
+        try:
+            # 执行提取
+            result = processor.extract_frames(
+                output_dir=output_dir,
+                start_time=args.start,
+                end_time=args.end,
+                frame_interval=args.interval,
+                progress_callback=progress_callback,
+                use_grab_skip=args.interval > 1,
+                save_pool=save_pool,
+                output_format=output_format,
+                quality=quality,
+                png_compress_level=args.png_level,
+                backend='nvdec' if args.gpu_decode else args.backend,
+                resize=args.resize,
+                ffmpeg_mux=args.ffmpeg_mux,
+                keyframes_only=args.keyframes_only,
+                use_processes=encode_processes,
+                quality_preset=args.preset,
+                max_workers=max(1, (os.cpu_count() or 4) // processes) if encode_processes else None
+            )
+        finally:
+            if save_pool is not None:
+                save_pool.shutdown(wait=True)
+            if pinned:
+                pin_current_thread(cpus)
         
         print()  # 换行
         print()
@@ -176,6 +301,58 @@ def extract_frames_cli(args) -> bool:
         return False
 
 
+def _run_one(args) -> bool:
+    """子进程入口：处理单个视频"""
+    configure_opencv()
+    return extract_frames_cli(args)
+
+
+def extract_videos_cli(args) -> int:
+    """
+    命令行模式批量处理多个视频，每个视频在独立进程中提取，互不受 GIL 限制
+    
+    Returns:
+        退出码
+    """
+    videos = args.video
+    processes = max(1, min(len(videos), (os.cpu_count() or 2) // 2))
+    
+    jobs = []
+    for video in videos:
+        job = argparse.Namespace(**vars(args))
+        job.video = video
+        job.processes = processes
+        # 指定了输出目录时，每个视频输出到以视频名命名的子目录，避免文件名冲突
+        if args.output:
+            job.output = os.path.join(args.output, os.path.splitext(os.path.basename(video))[0])
+        jobs.append(job)
+    
+    print(f"共 {len(videos)} 个视频，并行进程数: {processes}")
+    print()
+    
+    with multiprocessing.Pool(processes=processes) as pool:
+        results = pool.map(_run_one, jobs)
+    
+    failed = [video for video, ok in zip(videos, results) if not ok]
+    print()
+    print(f"全部完成：成功 {len(videos) - len(failed)} 个，失败 {len(failed)} 个")
+    for video in failed:
+        print(f"  失败: {video}")
+    return 0 if not failed else 1
+
+
+def configure_opencv():
+    """
+    配置 OpenCV 运行时
+    
+    - setNumThreads(0)：由 OpenCV 自动选择线程数，部分发行版默认单线程，会让内部并行（色彩转换、缩放等）串行化
+    - setUseOpenCL(False)：逐帧处理的数据量较小，OpenCL 初始化与上下传输开销远大于收益
+    """
+    import cv2
+    cv2.setNumThreads(0)
+    cv2.ocl.setUseOpenCL(False)
+
+
 def main():
     """主函数"""
     # 解析命令行参数
@@ -185,19 +362,33 @@ def main():
         add_help=False
     )
     
-    parser.add_argument('video', nargs='?', help='视频文件路径')
+    parser.add_argument('video', nargs='*', help='视频文件路径 (可指定多个)')
     parser.add_argument('-h', '--help', action='store_true', help='显示帮助信息')
     parser.add_argument('-o', '--output', help='输出目录')
     parser.add_argument('-s', '--start', default='00:00:00', help='开始时间 (HH:MM:SS)')
     parser.add_argument('-e', '--end', help='结束时间 (HH:MM:SS)')
     parser.add_argument('-i', '--interval', type=int, default=1, help='帧间隔')
+    parser.add_argument('-f', '--format', choices=['png', 'jpg', 'jpeg', 'webp'], default='jpg', help='输出格式')
+    parser.add_argument('-q', '--quality', type=int, help='JPEG/WebP 质量 (1-100)')
+    parser.add_argument('--png-level', type=int, default=1, help='PNG 压缩等级 (0-9)')
+    parser.add_argument('--preset', choices=['fast', 'balanced', 'archive'], help='编码质量预设')
+    parser.add_argument('--backend', choices=['auto', 'pyav', 'ffmpeg', 'opencv', 'decord'], default='auto', help='解码后端')
+    parser.add_argument('--gpu-decode', action='store_true', help='使用 NVDEC 硬件解码 (ffmpegcv)')
+    parser.add_argument('--ffmpeg-mux', action='store_true', help='原始帧经管道交给 ffmpeg 编码输出')
+    parser.add_argument('--keyframes-only', action='store_true', help='只提取关键帧 (需安装 PyAV 或 FFmpeg)')
+    parser.add_argument('--encode-processes', action='store_true', help='PNG/无损 WebP 使用多进程编码')
+    parser.add_argument('--threadpool-scaling', type=float, default=1.0, help='编码线程数系数')
+    parser.add_argument('--resize', type=parse_resize, help='输出尺寸 (WxH)')
     parser.add_argument('--gui', action='store_true', help='强制启动GUI')
     parser.add_argument('--no-gui', action='store_true', help='强制使用命令行模式')
+    parser.add_argument('--quiet', action='store_true', help='不显示启动横幅')
+    parser.add_argument('--pin-cpus', action='store_true', help='将解码与编码线程绑定到不同 CPU 核心 (仅 Linux)')
     
     args = parser.parse_args()
     
-    # 显示横幅
-    print_banner()
+    # 显示横幅（--quiet 或输出被重定向时跳过）
+    if not args.quiet and sys.stdout.isatty():
+        print_banner()
     
     # 显示帮助
     if args.help:
@@ -221,6 +412,8 @@ def main():
     if use_gui:
         print("启动图形界面...")
         try:
+            # 仅在 GUI 模式下导入 Tk 相关模块，缩短命令行模式的启动时间
+            from main_gui import VideoFrameExtractorGUI
             app = VideoFrameExtractorGUI()
             app.run()
             return 0
@@ -235,13 +428,21 @@ def main():
             print("使用 'python main.py --help' 查看帮助信息")
             return 1
         
+        configure_opencv()
+        
         # 验证参数
-        valid, error_msg = validate_arguments(args)
-        if not valid:
-            print(f"参数错误: {error_msg}")
-            return 1
+        for video in args.video:
+            valid, error_msg = validate_arguments(argparse.Namespace(**{**vars(args), 'video': video}))
+            if not valid:
+                print(f"参数错误: {error_msg}")
+                return 1
+        
+        # 多个视频：每个视频一个进程并行提取
+        if len(args.video) > 1:
+            return extract_videos_cli(args)
         
         # 执行提取
+        args.video = args.video[0]
         success = extract_frames_cli(args)
         return 0 if success else 1
 
@@ -3,28 +3,108 @@
 提供完整的图形用户界面，包括视频选择、参数设置、预览功能等
 """
 
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
+import queue
 import os
+import re
 import time
-from typing import Optional
-import cv2
-from PIL import Image, ImageTk
+from typing import Optional, TYPE_CHECKING
+from collections import OrderedDict, deque
+from enum import IntEnum
 
-from video_processor import VideoProcessor, create_output_directory, format_duration
 from utils import (
-    is_video_file, get_file_size_mb, create_thumbnail, opencv_to_pil,
-    resize_image_for_display, save_project_config, load_project_config,
+    is_video_filename, get_file_size_mb, create_thumbnail,
+    save_project_config, load_project_config, flush_project_config,
     add_recent_file, clean_output_directory, get_directory_info,
-    validate_output_path, get_available_space_gb, estimate_output_size,
+    validate_output_path, ensure_output_dir, get_available_space_gb, estimate_output_size,
     center_window, get_supported_video_formats
 )
 
 
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import ImageTk
+    from video_processor import VideoProcessor
+
+# OpenCV / NumPy / PIL 及视频处理模块加载耗时较长，启动时在后台线程导入，
+# 窗口可以先显示出来；真正用到时若尚未导入完成则等待
+_heavy_import_lock = threading.Lock()
+_heavy_imported = False
+
+
+def _import_heavy_modules():
+    """导入图像处理相关模块并绑定为模块级名称（只执行一次）"""
+    global cv2, np, Image, ImageTk, preview_kernels
+    global VideoProcessor, create_output_directory, format_duration, _heavy_imported
+    with _heavy_import_lock:
+        if _heavy_imported:
+            return
+        import cv2
+        import numpy as np
+        from PIL import Image, ImageTk
+        import preview_kernels
+        from video_processor import VideoProcessor, create_output_directory, format_duration
+        _heavy_imported = True
+
+
+# HH:MM:SS[.fff]，同时兼容以 '-' 分隔的写法
+_HMS_RE = re.compile(r'^\s*(\d+)[:-](\d+)[:-](\d+(?:\.\d*)?)\s*$')
+
+# 日志时间戳缓存：[秒数, 格式化结果]，同一秒内的日志复用同一个字符串
+_ts_cache = [0, '']
+
+
+def _ts() -> str:
+    """返回当前时间的 HH:MM:SS 字符串，每秒只调用一次 strftime"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[1] = time.strftime("%H:%M:%S", time.localtime(now))
+        _ts_cache[0] = now
+    return _ts_cache[1]
+
+
+class OutputFormat(IntEnum):
+    """输出格式，取值即下拉框中的选项序号"""
+    PNG = 0
+    WEBP = 1
+    JPEG = 2
+
+    @property
+    def ext(self) -> str:
+        """扩展名（统一为 'jpeg' 而非 'jpg'）"""
+        return _FORMAT_EXTS[self]
+
+    @classmethod
+    def from_ext(cls, ext: str) -> 'OutputFormat':
+        """由扩展名得到输出格式，未知扩展名按 WebP 处理"""
+        ext = (ext or '').lower()
+        if ext == 'jpg':
+            ext = 'jpeg'
+        return cls(_FORMAT_EXTS.index(ext)) if ext in _FORMAT_EXTS else cls.WEBP
+
+
+# 以下元组均按 OutputFormat 的取值索引
+_FORMAT_EXTS = ('png', 'webp', 'jpeg')
+_FORMAT_LABELS = ('PNG（快速/占用大）', 'WebP（较慢/占用小）', 'JPEG（极快/有损）')
+
+
 class VideoFrameExtractorGUI:
     """视频帧提取工具GUI类"""
     
+    # 日志区域最多保留的行数，超出后每累计 50 行批量删除最早的内容
+    _LOG_MAX_LINES = 500
+    
+    # 单张输出文件过大提醒的阈值（MB），按输出格式区分
+    _SIZE_WARN_THRESHOLDS = {'png': 10.0, 'webp': 6.0, 'jpg': 6.0, 'jpeg': 6.0}
+    
+    # 预览帧环形缓冲区的槽位数上限与内存预算
+    _PREVIEW_RING_SLOTS = 8
+    _PREVIEW_RING_BUDGET = 128 * 1024 * 1024
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("视频帧提取工具 v1.0")
@@ -37,11 +117,49 @@ class VideoFrameExtractorGUI:
         self.is_extracting = False
         self.extraction_thread = None
         self.large_file_warned = False
+        self.extract_format = ""  # 本次提取的输出格式，提取开始时确定
 
         # 预览后台线程状态
         self.preview_target_seconds = 0.0
         self.preview_worker = None
         self.preview_worker_stop = threading.Event()
+        # 解码线程与主线程之间的单槽预览帧队列（生产者/消费者），新帧直接替换未显示的旧帧
+        self._preview_queue = queue.Queue(maxsize=1)
+        self._preview_target_lock = threading.Lock()
+        self._preview_target_changed = threading.Event()
+        # 已显示预览图的 LRU 缓存：(帧号, 画布宽, 高) -> PhotoImage，回拖到看过的位置时无需重新解码
+        self._photo_cache: "OrderedDict[tuple, ImageTk.PhotoImage]" = OrderedDict()
+        self._preview_canvas_size = (0, 0)
+        # 最近解码的预览帧：连续的 (槽位, H, W, 3) 数组 + 每个槽位对应的帧号（-1 表示空）
+        self._preview_ring: Optional[np.ndarray] = None
+        self._preview_meta: Optional[np.ndarray] = None
+        # 预览缩放/颜色转换的复用缓冲区 (缩放后的 BGR, RGB)，尺寸变化时才重新分配；只在主线程使用
+        self._preview_scratch: Optional[tuple] = None
+        self._preview_ring_next = 0
+        # 已交给主线程的槽位：队列中待显示的与主线程正在显示的，解码线程写入时跳过这两个槽位，
+        # 避免覆盖主线程仍在读取的帧；-1 表示无
+        self._preview_slot_lock = threading.Lock()
+        self._preview_queued_slot = -1
+        self._preview_shown_slot = -1
+        # 关键帧时间表（秒）：拖动过程中预览吸附到最近的关键帧，松开后再精确定位
+        self._keyframe_secs = ()
+        self._preview_exact_seconds = 0.0
+        # 拖动中的取帧请求合并为每 100ms 至多一次，松开时精确定位
+        self._preview_seek_job = None
+        self._preview_dragging = False
+        # OpenCL / Numba 预览加速，在后台导入完成后由 configure_opencv 确定
+        self._use_opencl = False
+        self._preview_kernel_ready = False
+        self._has_nvdec = False
+        # 时间输入框与拖动条联动：输入防抖任务与重入保护
+        self._sync_job = {'start': None, 'end': None}
+        self._syncing = False
+        # 日志区域当前行数；待写入的日志行先进入队列，每 50ms 合并插入一次
+        self._log_lines = 0
+        self._log_queue = deque(maxlen=self._LOG_MAX_LINES)
+        self._log_flush_scheduled = False
+        # 最近文件菜单上次渲染的 ((路径, 是否存在), ...)，未变化时不重建菜单
+        self._last_recent_render = ()
         
         # 加载配置
         self.config = load_project_config()
@@ -59,6 +177,55 @@ class VideoFrameExtractorGUI:
                 center_window(self.root, 1000, 940)
         else:
             center_window(self.root, 1000, 940)
+        
+        # 后台导入图像处理模块，完成前状态栏显示初始化提示
+        self.status_var.set("初始化中...")
+        threading.Thread(target=self._warm_imports, daemon=True).start()
+    
+    def _warm_imports(self):
+        """后台线程：导入图像处理模块，完成后回到主线程配置 OpenCV"""
+        try:
+            _import_heavy_modules()
+        except Exception as e:
+            self.root.after(0, self.log_message, f"模块加载失败: {str(e)}", "error")
+            return
+        self.root.after(0, self._on_imports_ready)
+    
+    def _on_imports_ready(self):
+        self.configure_opencv()
+        self._has_nvdec = VideoProcessor._nvdec_available()
+        if self._has_nvdec:
+            self.nvdec_check.configure(state='normal')
+        else:
+            self.nvdec_var.set(False)
+        if self.status_var.get() == "初始化中...":
+            self.status_var.set("就绪")
+    
+    def configure_opencv(self):
+        """
+        配置预览使用的 OpenCV 运行时
+        
+        - 线程数取 CPU 核数的一半，为 Tk 主线程与解码线程留出余量
+        - 检测到可用的 OpenCL 设备时，预览缩放与色彩转换走 UMat（OpenCL），否则使用 CPU
+        """
+        cv2.setNumThreads(max(2, (os.cpu_count() or 2) // 2))
+        try:
+            if cv2.ocl.haveOpenCL():
+                cv2.ocl.setUseOpenCL(True)
+                self._use_opencl = cv2.ocl.useOpenCL()
+        except Exception:
+            self._use_opencl = False
+        
+        # 安装了 numba 时在后台预编译预览内核，编译完成前使用 OpenCV 路径
+        if preview_kernels.NUMBA_AVAILABLE and not self._use_opencl:
+            threading.Thread(target=self._warmup_preview_kernel, daemon=True).start()
+    
+    def _warmup_preview_kernel(self):
+        try:
+            preview_kernels.warmup()
+            self._preview_kernel_ready = True
+        except Exception:
+            self._preview_kernel_ready = False
     
     def create_widgets(self):
         """创建界面组件"""
@@ -133,37 +300,81 @@ class VideoFrameExtractorGUI:
 
         # 输出格式选择
         ttk.Label(self.output_frame, text="输出格式:").grid(row=1, column=0, sticky="w", padx=(0, 5), pady=(8, 0))
-        self.output_format_var = tk.StringVar(value=self.config.get('default_output_format', 'webp'))
-        self.output_format_display_map = {
-            'png': 'PNG（快速/占用大）',
-            'webp': 'WebP（较慢/占用小）',
-            'jpeg': 'JPEG（极快/有损）'
-        }
-        self.output_format_reverse_map = {v: k for k, v in self.output_format_display_map.items()}
-        initial_display = self.output_format_display_map.get(self.output_format_var.get(), 'WebP（较慢/占用小）')
-        self.output_format_display_var = tk.StringVar(value=initial_display)
+        self._current_fmt = OutputFormat.from_ext(self.config.get('default_output_format', 'webp'))
         self.output_format_combo = ttk.Combobox(
             self.output_frame,
             state='readonly',
-            values=list(self.output_format_display_map.values()),
-            textvariable=self.output_format_display_var,
+            values=_FORMAT_LABELS,
             width=20
         )
+        self.output_format_combo.current(self._current_fmt)
+        self.output_format_combo.bind('<<ComboboxSelected>>', self.on_output_format_selected)
         self.output_format_combo.grid(row=1, column=1, sticky="w", padx=(0, 10), pady=(8, 0))
         ttk.Label(self.output_frame, text="说明: PNG体积大但快速；WebP体积小但较慢；JPEG非常快但有损。", font=("", 8)).grid(row=1, column=2, sticky="w", pady=(8, 0))
         
+        # 输出质量（JPEG / 有损 WebP）与 WebP 无损开关
+        ttk.Label(self.output_frame, text="输出质量:").grid(row=2, column=0, sticky="w", padx=(0, 5), pady=(8, 0))
+        self.quality_var = tk.IntVar(value=int(self.config.get('default_quality', 90)))
+        quality_row = ttk.Frame(self.output_frame)
+        quality_row.grid(row=2, column=1, columnspan=2, sticky="w", pady=(8, 0))
+        self.quality_scale = ttk.Scale(quality_row, from_=1, to=100, orient='horizontal', length=160,
+                                       command=lambda v: self.quality_var.set(int(float(v))))
+        self.quality_scale.set(self.quality_var.get())
+        self.quality_scale.pack(side='left')
+        ttk.Label(quality_row, textvariable=self.quality_var, width=4).pack(side='left', padx=(5, 10))
+        self.webp_lossless_var = tk.BooleanVar(value=bool(self.config.get('default_webp_lossless', True)))
+        ttk.Checkbutton(quality_row, text="WebP 无损", variable=self.webp_lossless_var).pack(side='left')
+        # 快速编码：使用 fast 质量预设（WebP 有损 q80 + method 0、JPEG q85 4:2:0、PNG 压缩等级 1）
+        self.fast_encode_var = tk.BooleanVar(value=bool(self.config.get('fast_encode', False)))
+        ttk.Checkbutton(quality_row, text="快速编码", variable=self.fast_encode_var).pack(side='left', padx=(10, 0))
+        # 硬件解码：使用 ffmpegcv 的 NVDEC（需 NVIDIA 显卡），可用性在后台导入完成后确定
+        self.nvdec_var = tk.BooleanVar(value=bool(self.config.get('use_nvdec', False)))
+        self.nvdec_check = ttk.Checkbutton(quality_row, text="硬件解码 (NVDEC)", variable=self.nvdec_var, state='disabled')
+        self.nvdec_check.pack(side='left', padx=(10, 0))
+        
+        # WebP 编码速度（method 0-6）：越快体积越大
+        ttk.Label(self.output_frame, text="编码速度:").grid(row=3, column=0, sticky="w", padx=(0, 5), pady=(8, 0))
+        self.webp_method_values = ['0（最快/体积大）', '1', '2', '3', '4（默认）', '5', '6（最慢/体积小）']
+        method = max(0, min(6, int(self.config.get('default_webp_method', 4))))
+        self.webp_method_var = tk.StringVar(value=self.webp_method_values[method])
+        self.webp_method_combo = ttk.Combobox(
+            self.output_frame,
+            state='readonly',
+            values=self.webp_method_values,
+            textvariable=self.webp_method_var,
+            width=20
+        )
+        self.webp_method_combo.grid(row=3, column=1, sticky="w", padx=(0, 10), pady=(8, 0))
+        ttk.Label(self.output_frame, text="说明: 仅对 WebP 生效；质量对 JPEG 与有损 WebP 生效。", font=("", 8)).grid(row=3, column=2, sticky="w", pady=(8, 0))
+        
+        # PNG 压缩等级（0-9）：1 级为 Huffman-only，最快；6 级体积与速度较均衡
+        ttk.Label(self.output_frame, text="PNG 压缩:").grid(row=4, column=0, sticky="w", padx=(0, 5), pady=(8, 0))
+        self.png_level_values = ['0（不压缩）', '1（最快/默认）', '2', '3', '4', '5', '6（均衡）', '7', '8', '9（最小体积）']
+        level = max(0, min(9, int(self.config.get('default_png_compress_level', 1))))
+        self.png_level_var = tk.StringVar(value=self.png_level_values[level])
+        ttk.Combobox(
+            self.output_frame,
+            state='readonly',
+            values=self.png_level_values,
+            textvariable=self.png_level_var,
+            width=20
+        ).grid(row=4, column=1, sticky="w", padx=(0, 10), pady=(8, 0))
+        ttk.Label(self.output_frame, text="说明: 仅对 PNG 生效；等级越高体积越小、编码越慢。", font=("", 8)).grid(row=4, column=2, sticky="w", pady=(8, 0))
+        
         # 预览区域
         self.preview_frame = ttk.LabelFrame(self.main_frame, text="预览", padding="10")
         
         # 预览控制（拖动条）
         self.preview_control_frame = ttk.Frame(self.preview_frame)
-        self.preview_time_var = tk.StringVar(value="00:00:00")
         ttk.Label(self.preview_control_frame, text="预览时间:").pack(side='left', padx=(0, 5))
         self.preview_scale = ttk.Scale(self.preview_control_frame, from_=0, to=1, orient='horizontal', command=self.on_preview_scale_changed)
         self.preview_scale.pack(side='left', fill='x', expand=True, padx=(0, 10))
-        self.preview_time_label = ttk.Label(self.preview_control_frame, textvariable=self.preview_time_var, width=10)
+        # 直接设置 Label 文本，不经 StringVar，拖动时少一轮 trace 与重绘
+        self.preview_time_label = ttk.Label(self.preview_control_frame, text="00:00:00", width=10)
+        self._last_label_update = 0.0
+        self._preview_label_job = None
         self.preview_time_label.pack(side='left')
-        self.preview_update_job = None  # 保留但不再用于密集取帧
+        self.preview_drain_job = None  # 主线程定时取出预览帧的 after 任务
         
         # 预览图像显示
         self.preview_canvas = tk.Canvas(self.preview_frame, width=400, height=300, bg='gray90')
@@ -204,10 +415,13 @@ class VideoFrameExtractorGUI:
         file_menu.add_separator()
         
         # 最近文件子菜单
-        self.recent_menu = tk.Menu(file_menu, tearoff=0)
+        # 每次展开时重新检查文件是否存在，列表未变化时不会重建
+        self.recent_menu = tk.Menu(file_menu, tearoff=0, postcommand=self.update_recent_menu)
         file_menu.add_cascade(label="最近文件", menu=self.recent_menu)
         self.update_recent_menu()
         
+        file_menu.add_separator()
+        file_menu.add_command(label="导出设置...", command=self.export_settings)
         file_menu.add_separator()
         file_menu.add_command(label="退出", command=self.on_closing)
         
@@ -266,6 +480,9 @@ class VideoFrameExtractorGUI:
     def bind_events(self):
         """绑定事件"""
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.preview_canvas.bind('<Configure>', self.on_preview_canvas_resized)
+        self.preview_scale.bind('<ButtonPress-1>', self.on_preview_scale_pressed)
+        self.preview_scale.bind('<ButtonRelease-1>', self.on_preview_scale_released)
         self.video_path_var.trace('w', self.on_video_path_changed)
         self.output_dir_var.trace('w', self.on_output_dir_changed)
         # 手动输入与拖动条联动
@@ -287,7 +504,7 @@ class VideoFrameExtractorGUI:
         
         if filename:
             self.video_path_var.set(filename)
-            add_recent_file(filename)
+            self.config['recent_files'] = add_recent_file(filename)
             self.update_recent_menu()
     
     def browse_output_dir(self):
@@ -304,7 +521,9 @@ class VideoFrameExtractorGUI:
         """视频路径改变事件"""
         video_path = self.video_path_var.get()
         
-        if video_path and os.path.isfile(video_path) and is_video_file(video_path):
+        # 输入框每次按键都会触发：先做不访问磁盘的扩展名判断，再检查文件是否存在
+        if video_path and is_video_filename(video_path) and os.path.isfile(video_path):
+            _import_heavy_modules()
             self.load_video(video_path)
             
             # 自动设置输出目录
@@ -320,6 +539,11 @@ class VideoFrameExtractorGUI:
     
     def load_video(self, video_path: str):
         """加载视频文件"""
+        _import_heavy_modules()
+        # 重新选择同一文件时复用已打开的处理器，保留解码器状态与元数据
+        if self.video_processor and video_path == self.current_video_path:
+            self.start_preview_worker()
+            return
         try:
             if self.video_processor:
                 self.video_processor.close()
@@ -328,6 +552,10 @@ class VideoFrameExtractorGUI:
             
             self.video_processor = VideoProcessor(video_path)
             self.current_video_path = video_path
+            self._photo_cache.clear()
+            self.allocate_preview_ring()
+            self._keyframe_secs = ()
+            threading.Thread(target=self._load_keyframe_index, args=(self.video_processor,), daemon=True).start()
             
             # 显示视频信息
             self.display_video_info()
@@ -339,9 +567,10 @@ class VideoFrameExtractorGUI:
             # 结束时间默认到结尾
             self.end_time_var.set(self.seconds_to_hms(duration))
             # 预览条默认 00:00:00
-            self.preview_time_var.set("00:00:00")
+            self.preview_time_label.configure(text="00:00:00")
             self.preview_scale.set(0)
-            self.preview_target_seconds = 0.0
+            self._preview_exact_seconds = 0.0
+            self.set_preview_target(0.0)
             # 启动预览后台线程
             self.start_preview_worker()
             
@@ -362,31 +591,19 @@ class VideoFrameExtractorGUI:
 
     @staticmethod
     def seconds_to_hms(seconds: float) -> str:
-        seconds = max(0, float(seconds))
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        h, rem = divmod(int(max(0, float(seconds))), 3600)
+        m, sec = divmod(rem, 60)
+        return "%02d:%02d:%02d" % (h, m, sec)
 
     @staticmethod
     def seconds_to_hms_precise(seconds: float) -> str:
         """将秒转换为 HH:MM:SS.mmm，保留毫秒以避免终点截断。"""
-        seconds = max(0, float(seconds))
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs_int = int(seconds % 60)
-        ms = int(round((seconds - int(seconds)) * 1000))
-        # 处理进位
-        if ms == 1000:
-            ms = 0
-            secs_int += 1
-            if secs_int == 60:
-                secs_int = 0
-                minutes += 1
-                if minutes == 60:
-                    minutes = 0
-                    hours += 1
-        return f"{hours:02d}:{minutes:02d}:{secs_int:02d}.{ms:03d}"
+        # 先四舍五入到整数毫秒再逐级拆分，进位自然完成
+        total_ms = int(max(0, float(seconds)) * 1000 + 0.5)
+        s_total, ms = divmod(total_ms, 1000)
+        m_total, sec = divmod(s_total, 60)
+        h, m = divmod(m_total, 60)
+        return "%02d:%02d:%02d.%03d" % (h, m, sec, ms)
 
     def on_start_scale_changed(self, value):
         try:
@@ -396,7 +613,9 @@ class VideoFrameExtractorGUI:
             if seconds > end_seconds:
                 seconds = end_seconds
                 self.start_scale.set(seconds)
-            self.start_time_var.set(self.seconds_to_hms(seconds))
+            # 由输入框同步触发时无需回写输入框，避免再次触发 trace
+            if not self._syncing:
+                self._set_time_var_from_scale(self.start_time_var, seconds)
         except Exception:
             pass
 
@@ -408,10 +627,19 @@ class VideoFrameExtractorGUI:
             if seconds < start_seconds:
                 seconds = start_seconds
                 self.end_scale.set(seconds)
-            self.end_time_var.set(self.seconds_to_hms(seconds))
+            if not self._syncing:
+                self._set_time_var_from_scale(self.end_time_var, seconds)
         except Exception:
             pass
 
+    def _set_time_var_from_scale(self, var: tk.StringVar, seconds: float):
+        """拖动条写回时间文本；置位 _syncing，使 trace 不再安排反向同步拖动条"""
+        self._syncing = True
+        try:
+            var.set(self.seconds_to_hms(seconds))
+        finally:
+            self._syncing = False
+
     def on_interval_scale_changed(self, value):
         try:
             iv = max(1, int(float(value)))
@@ -431,39 +659,105 @@ class VideoFrameExtractorGUI:
             pass
 
     def on_preview_scale_changed(self, value):
+        """拖动条每移动一个像素都会触发：只记录位置并刷新标签，取帧请求做 60ms 尾沿防抖"""
         try:
-            seconds = float(value)
-            self.preview_time_var.set(self.seconds_to_hms(seconds))
-            # 仅更新目标秒数，由后台线程拉取帧；避免阻塞UI线程
-            self.preview_target_seconds = seconds
+            self._preview_exact_seconds = float(value)
+            self.update_preview_time_label()
+            # 每次移动都重新计时，只有停顿 60ms 后的最终位置才会触发解码
+            if self._preview_seek_job is not None:
+                self.root.after_cancel(self._preview_seek_job)
+            self._preview_seek_job = self.root.after(60, self._commit_preview_seek)
         except Exception:
             pass
 
+    def _commit_preview_seek(self):
+        """发出合并后的取帧请求：拖动中吸附到最近的关键帧，否则精确定位"""
+        self._preview_seek_job = None
+        seconds = self._preview_exact_seconds
+        if self._preview_dragging:
+            # 关键帧解码无需从前一个关键帧向后逐帧推进
+            seconds = self.nearest_keyframe(seconds)
+        self.set_preview_target(seconds)
+
+    def on_preview_scale_pressed(self, event=None):
+        self._preview_dragging = True
+
+    def on_preview_scale_released(self, event=None):
+        """松开拖动条：精确定位到拖动条所在时间"""
+        self._preview_dragging = False
+        if self._preview_seek_job is not None:
+            self.root.after_cancel(self._preview_seek_job)
+            self._preview_seek_job = None
+        self.set_preview_target(self._preview_exact_seconds)
+        self.update_preview_time_label()
+
+    def nearest_keyframe(self, seconds: float) -> float:
+        """返回距离 seconds 最近的关键帧时间；关键帧表不可用时原样返回"""
+        keyframes = self._keyframe_secs
+        if len(keyframes) == 0:
+            return seconds
+        i = int(np.searchsorted(keyframes, seconds))
+        if i >= len(keyframes):
+            return float(keyframes[-1])
+        if i > 0 and seconds - keyframes[i - 1] < keyframes[i] - seconds:
+            return float(keyframes[i - 1])
+        return float(keyframes[i])
+
+    def _load_keyframe_index(self, processor: VideoProcessor):
+        """后台线程：读取关键帧时间表，仅在视频未切换时生效"""
+        keyframes = processor.get_keyframe_times()
+        if processor is self.video_processor:
+            self._keyframe_secs = keyframes
+
+    def update_preview_time_label(self):
+        """按不超过 30Hz 的频率刷新预览时间标签；被节流时补一次延迟刷新，保证停在最终位置"""
+        now = time.monotonic()
+        if now - self._last_label_update < 0.033:
+            if self._preview_label_job is None:
+                self._preview_label_job = self.root.after(33, self._flush_preview_time_label)
+            return
+        self._last_label_update = now
+        self.preview_time_label.configure(text=self.seconds_to_hms(self._preview_exact_seconds))
+
+    def _flush_preview_time_label(self):
+        self._preview_label_job = None
+        self._last_label_update = 0.0
+        self.update_preview_time_label()
+
     def sync_scale_with_entry(self, which: str):
-        """当手动输入时间时，同步拖动条位置"""
+        """当手动输入时间时，同步拖动条位置（150ms 防抖，连续输入只同步一次）"""
+        if self._syncing:
+            return
+        job = self._sync_job[which]
+        if job is not None:
+            self.root.after_cancel(job)
+        self._sync_job[which] = self.root.after(150, lambda: self._do_sync_scale(which))
+
+    def _do_sync_scale(self, which: str):
+        self._sync_job[which] = None
         try:
             time_str = self.start_time_var.get() if which == 'start' else self.end_time_var.get()
             # 转为秒
             secs = self.hms_to_seconds(time_str)
             if secs is None:
                 return
+            self._syncing = True
             if which == 'start':
                 self.start_scale.set(secs)
             else:
                 self.end_scale.set(secs)
         except Exception:
             pass
+        finally:
+            self._syncing = False
 
     @staticmethod
     def hms_to_seconds(hms: str) -> Optional[float]:
-        try:
-            parts = hms.replace('-', ':').split(':')
-            if len(parts) != 3:
-                return None
-            h, m, s = int(parts[0]), int(parts[1]), float(parts[2])
-            return float(h * 3600 + m * 60 + s)
-        except Exception:
+        m = _HMS_RE.match(hms)
+        if not m:
             return None
+        h, mm, s = m.groups()
+        return int(h) * 3600 + int(mm) * 60 + float(s)
     
     def display_video_info(self):
         """显示视频信息"""
@@ -503,7 +797,7 @@ class VideoFrameExtractorGUI:
         if not output_dir:
             return
         
-        dir_info = get_directory_info(output_dir)
+        dir_info = get_directory_info(output_dir, include_files=False)
         if dir_info['exists'] and dir_info['file_count'] > 0:
             self.log_message(f"输出目录已存在 {dir_info['file_count']} 个文件")
     
@@ -513,7 +807,7 @@ class VideoFrameExtractorGUI:
             messagebox.showwarning("警告", "请先选择视频文件")
             return
         
-        time_str = self.preview_time_var.get()
+        time_str = self.seconds_to_hms(self._preview_exact_seconds)
         try:
             frame = self.video_processor.get_frame_at_time(time_str)
             if frame is not None:
@@ -527,23 +821,111 @@ class VideoFrameExtractorGUI:
         """按秒预览（供拖动条节流调用）"""
         # 改为由后台线程处理，此方法不再主动读取帧
         try:
-            self.preview_target_seconds = float(seconds)
+            self.set_preview_target(float(seconds))
         except Exception:
             pass
+
+    def set_preview_target(self, seconds: float):
+        """更新预览目标秒数并唤醒解码线程；拖动过程中的中间位置会被直接覆盖"""
+        with self._preview_target_lock:
+            self.preview_target_seconds = seconds
+        self._preview_target_changed.set()
     
-    def display_preview_frame(self, frame):
-        """显示预览帧"""
+    def allocate_preview_ring(self):
+        """按视频尺寸一次性分配预览帧环形缓冲区，槽位数受内存预算限制（至少比在途帧数多 1 个）"""
+        info = self.video_processor.video_info
+        width, height = int(info.get('width', 0)), int(info.get('height', 0))
+        self._preview_meta = np.full(self._PREVIEW_RING_SLOTS, -1, dtype=np.int64)
+        self._preview_ring_next = 0
+        if width <= 0 or height <= 0:
+            self._preview_ring = None
+            return
+        slots = max(3, min(self._PREVIEW_RING_SLOTS, self._PREVIEW_RING_BUDGET // (width * height * 3)))
+        self._preview_ring = np.empty((slots, height, width, 3), dtype=np.uint8)
+
+    def _preview_ring_lookup(self, frame_idx: int) -> int:
+        """在环形缓冲区中查找已解码的帧，返回槽位号，未找到返回 -1"""
+        if self._preview_ring is None:
+            return -1
+        slots = np.flatnonzero(self._preview_meta[:len(self._preview_ring)] == frame_idx)
+        return int(slots[0]) if len(slots) else -1
+
+    def _preview_ring_store(self, frame_idx: int, frame: np.ndarray) -> int:
+        """将解码帧复制进环形缓冲区的下一个空闲槽位，返回槽位号；尺寸不符时返回 -1"""
+        ring = self._preview_ring
+        if ring is None or frame.shape != ring.shape[1:]:
+            return -1
+        with self._preview_slot_lock:
+            busy = (self._preview_queued_slot, self._preview_shown_slot)
+        # 槽位数至少为 3，跳过已交给主线程的两个槽位后总有可写的槽位
+        slot = self._preview_ring_next
+        while slot in busy:
+            slot = (slot + 1) % len(ring)
+        self._preview_ring_next = (slot + 1) % len(ring)
+        self._preview_meta[slot] = -1
+        np.copyto(ring[slot], frame)
+        self._preview_meta[slot] = frame_idx
+        return slot
+
+    def on_preview_canvas_resized(self, event):
+        """预览画布尺寸变化：记录新尺寸并清空按旧尺寸缓存的预览图"""
+        size = (event.width, event.height)
+        if size != self._preview_canvas_size:
+            self._preview_canvas_size = size
+            self._photo_cache.clear()
+
+    def display_preview_frame(self, frame, frame_idx: Optional[int] = None):
+        """
+        显示预览帧
+        
+        Args:
+            frame: 帧图像（BGR），为 None 时仅从缓存取图
+            frame_idx: 帧号，提供时按 (帧号, 画布尺寸) 缓存生成的 PhotoImage
+        """
         try:
             # 调整图像大小适应画布
             canvas_width = self.preview_canvas.winfo_width()
             canvas_height = self.preview_canvas.winfo_height()
             
             if canvas_width > 1 and canvas_height > 1:
-                resized_frame = resize_image_for_display(frame, canvas_width, canvas_height)
-                
-                # 转换为PIL图像
-                pil_image = opencv_to_pil(resized_frame)
-                photo = ImageTk.PhotoImage(pil_image)
+                key = (frame_idx, canvas_width, canvas_height)
+                photo = self._photo_cache.get(key) if frame_idx is not None else None
+                if photo is not None:
+                    self._photo_cache.move_to_end(key)
+                elif frame is not None:
+                    # 等比缩放到画布内（不放大），再一次性转为 RGB
+                    height, width = frame.shape[:2]
+                    scale = min(canvas_width / width, canvas_height / height, 1.0)
+                    if scale < 1.0:
+                        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+                    else:
+                        size = (width, height)
+                    scratch_bgr, scratch_rgb = self._get_preview_scratch(size)
+                    raw_mode = 'BGR'
+                    if scale < 1.0 and self._preview_kernel_ready:
+                        # Numba 内核：缩放与通道交换一次并行完成
+                        pixels = preview_kernels.resize_bgr_to_rgb(frame, size[1], size[0], out=scratch_rgb)
+                        raw_mode = 'RGB'
+                    elif self._use_opencl:
+                        src = cv2.UMat(frame)
+                        if scale < 1.0:
+                            src = cv2.resize(src, size, interpolation=cv2.INTER_AREA)
+                        pixels = src.get()
+                    else:
+                        # 写入复用缓冲区，拖动预览时不再逐帧分配整幅图像
+                        pixels = np.ascontiguousarray(frame)
+                        if scale < 1.0:
+                            pixels = cv2.resize(frame, size, dst=scratch_bgr, interpolation=cv2.INTER_AREA)
+                    # frombuffer 从 NumPy 缓冲区拷贝一次（BGR 输入在这次拷贝中顺带交换通道，省去 cvtColor），
+                    # 随后 PhotoImage 再拷贝，复用缓冲区是安全的
+                    pil_image = Image.frombuffer('RGB', size, pixels, 'raw', raw_mode, 0, 1)
+                    photo = ImageTk.PhotoImage(pil_image)
+                    if frame_idx is not None:
+                        self._photo_cache[key] = photo
+                        if len(self._photo_cache) > 64:
+                            self._photo_cache.popitem(last=False)
+                else:
+                    return
                 
                 # 在画布中央显示
                 self.preview_canvas.delete("all")
@@ -557,6 +939,16 @@ class VideoFrameExtractorGUI:
         except Exception as e:
             self.log_message(f"预览显示失败: {str(e)}", "error")
     
+    def _get_preview_scratch(self, size: tuple) -> tuple:
+        """返回 (width, height) 尺寸的预览复用缓冲区，尺寸变化时重新分配"""
+        width, height = size
+        scratch = self._preview_scratch
+        if scratch is None or scratch[0].shape[:2] != (height, width):
+            scratch = (np.empty((height, width, 3), dtype=np.uint8),
+                       np.empty((height, width, 3), dtype=np.uint8))
+            self._preview_scratch = scratch
+        return scratch
+    
     def start_extraction(self):
         """开始提取帧"""
         if self.is_extracting:
@@ -579,6 +971,8 @@ class VideoFrameExtractorGUI:
             
             # 检查输出目录
             valid, error_msg = validate_output_path(output_dir)
+            if valid:
+                valid, error_msg = ensure_output_dir(output_dir)
             if not valid:
                 messagebox.showerror("错误", f"输出路径无效: {error_msg}")
                 return
@@ -589,25 +983,23 @@ class VideoFrameExtractorGUI:
                 estimated_size = estimate_output_size(
                     max(1, info['total_frames'] // max(1, frame_interval)),
                     info['width'],
-                    info['height']
+                    info['height'],
+                    output_format,
+                    lossless=bool(self.webp_lossless_var.get()) and not self.fast_encode_var.get()
                 )
-                format_scale = {
-                    'png': 1.0,
-                    'webp': 0.4,
-                    'jpeg': 0.25,
-                    'jpg': 0.25
-                }.get(output_format, 1.0)
-                estimated_size *= format_scale
-                available_space = get_available_space_gb(output_dir) * 1024  # 转换为MB
-                
-                if estimated_size > available_space * 0.9:  # 保留10%空间
-                    if not messagebox.askyesno("警告", 
-                        f"估算输出大小: {estimated_size:.1f} MB\n"
-                        f"可用空间: {available_space:.1f} MB\n"
-                        f"按当前输出格式（{output_format.upper()}）估算，空间可能不足，是否继续？"):
-                        return
+                # 估算输出不足 50MB 时跳过磁盘空间查询
+                if estimated_size > 50:
+                    available_space = get_available_space_gb(output_dir) * 1024  # 转换为MB
+                    
+                    if estimated_size > available_space * 0.9:  # 保留10%空间
+                        if not messagebox.askyesno("警告", 
+                            f"估算输出大小: {estimated_size:.1f} MB\n"
+                            f"可用空间: {available_space:.1f} MB\n"
+                            f"按当前输出格式（{output_format.upper()}）估算，空间可能不足，是否继续？"):
+                            return
             
             # 开始提取
+            self.extract_format = output_format
             self.is_extracting = True
             self.update_ui_state()
             # 提取期间暂停预览，降低CPU竞争
@@ -615,7 +1007,10 @@ class VideoFrameExtractorGUI:
             
             self.extraction_thread = threading.Thread(
                 target=self.extraction_worker,
-                args=(start_time, end_time, frame_interval, output_dir, output_format),
+                args=(start_time, end_time, frame_interval, output_dir, output_format,
+                      self.quality_var.get(), self.webp_lossless_var.get(), self.get_selected_webp_method(),
+                      self.fast_encode_var.get(), self.nvdec_var.get() and self._has_nvdec,
+                      self.get_selected_png_level()),
                 daemon=True
             )
             self.extraction_thread.start()
@@ -625,62 +1020,100 @@ class VideoFrameExtractorGUI:
         except Exception as e:
             messagebox.showerror("错误", f"启动提取失败: {str(e)}")
     
-    def extraction_worker(self, start_time: str, end_time: Optional[str], frame_interval: int, output_dir: str, output_format: str):
+    def extraction_worker(self, start_time: str, end_time: Optional[str], frame_interval: int, output_dir: str, output_format: str,
+                          quality: int = 90, lossless: bool = True, webp_method: int = 4,
+                          fast_encode: bool = False, use_nvdec: bool = False, png_compress_level: int = 1):
         """提取工作线程"""
         try:
+            # 进度先在工作线程中累积，由刷新线程每 100ms 批量交给主线程一次，
+            # 避免逐帧 after 回调占满 Tk 事件队列
+            pending = deque()
+            flush_stop = threading.Event()
+            
             def progress_callback(current, total, frame_path):
                 if not self.is_extracting:
                     return
-                
-                progress = (current / total) * 100
-                self.root.after(0, lambda: self.update_progress(progress, current, total, frame_path))
+                pending.append((current, total, frame_path))
+            
+            def flush():
+                batch = []
+                while pending:
+                    batch.append(pending.popleft())
+                if batch:
+                    self.root.after(0, lambda: self._apply_progress_batch(batch))
+            
+            def flush_loop():
+                while not flush_stop.wait(0.1):
+                    flush()
             
             self.log_message("开始提取帧...")
             start_time_extract = time.time()
             
-            result = self.video_processor.extract_frames(
-                output_dir=output_dir,
-                start_time=start_time,
-                end_time=end_time,
-                frame_interval=frame_interval,
-                progress_callback=progress_callback,
-                use_threading=True,
-                output_format=output_format
-            )
+            flusher = threading.Thread(target=flush_loop, daemon=True)
+            flusher.start()
+            try:
+                result = self.video_processor.extract_frames(
+                    output_dir=output_dir,
+                    start_time=start_time,
+                    end_time=end_time,
+                    frame_interval=frame_interval,
+                    progress_callback=progress_callback,
+                    use_threading=True,
+                    backend='nvdec' if use_nvdec else 'auto',
+                    output_format=output_format,
+                    # 无损 WebP 不使用质量参数
+                    quality=None if (output_format == 'webp' and lossless) else quality,
+                    lossless=lossless,
+                    webp_method=webp_method,
+                    png_compress_level=png_compress_level,
+                    # 快速编码使用 fast 预设：WebP 有损 + method 0，JPEG 4:2:0，PNG 1 级
+                    quality_preset='fast' if fast_encode else None
+                )
+            finally:
+                flush_stop.set()
+                flusher.join()
+                flush()
             
             if self.is_extracting:  # 检查是否被停止
                 extract_duration = time.time() - start_time_extract
                 self.root.after(0, lambda: self.extraction_completed(result, extract_duration))
             
         except Exception as e:
-            self.root.after(0, lambda: self.extraction_failed(str(e)))
+            self.root.after(0, self.extraction_failed, str(e))
     
-    def update_progress(self, progress: float, current: int, total: int, frame_path: str):
-        """更新进度显示"""
+    def _apply_progress_batch(self, batch: list):
+        """
+        批量更新进度显示：进度条与状态只按最后一帧更新一次，日志一次性插入
+        
+        Args:
+            batch: [(当前数, 总数, 帧文件路径), ...]
+        """
+        current, total, frame_path = batch[-1]
+        progress = (current / total) * 100
         self.progress_var.set(progress)
         self.status_var.set(f"正在提取: {current}/{total} ({progress:.1f}%)")
         
-        filename = os.path.basename(frame_path)
-        self.log_message(f"已提取: {filename}")
-        if not self.large_file_warned:
-            try:
-                size_mb = get_file_size_mb(frame_path)
-                ext = os.path.splitext(filename)[1].lower().lstrip('.')
-                threshold_map = {
-                    'png': 10.0,
-                    'webp': 6.0,
-                    'jpg': 6.0,
-                    'jpeg': 6.0
-                }
-                threshold = threshold_map.get(ext, 10.0)
-                if size_mb >= threshold:
-                    self.large_file_warned = True
-                    messagebox.showwarning(
-                        "文件过大警告",
-                        f"检测到单张文件较大: {filename}\n大小约 {size_mb:.1f} MB\n格式: {ext.upper()}\n建议：降低压缩强度或改用 WebP/JPEG，以减少占用。"
-                    )
-            except Exception:
-                pass
+        timestamp = _ts()
+        self._log_queue.extend(
+            f"[{timestamp}] 已提取: {os.path.basename(path)}\n" for _, _, path in batch
+        )
+        self._schedule_log_flush()
+        
+        # 已提醒过则不再检查文件大小，省去每批一次的 stat
+        if self.large_file_warned:
+            return
+        try:
+            size_mb = get_file_size_mb(frame_path)
+            ext = self.extract_format
+            if size_mb >= self._SIZE_WARN_THRESHOLDS.get(ext, 10.0):
+                self.large_file_warned = True
+                filename = os.path.basename(frame_path)
+                messagebox.showwarning(
+                    "文件过大警告",
+                    f"检测到单张文件较大: {filename}\n大小约 {size_mb:.1f} MB\n格式: {ext.upper()}\n建议：降低压缩强度或改用 WebP/JPEG，以减少占用。"
+                )
+        except Exception:
+            pass
     
     def extraction_completed(self, result: dict, extract_duration: float):
         """提取完成"""
@@ -781,32 +1214,80 @@ class VideoFrameExtractorGUI:
             self.stop_button.config(state='disabled')
     
     def log_message(self, message: str, level: str = "info"):
-        """记录日志消息"""
-        timestamp = time.strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
+        """记录日志消息（合并到下一次刷新时一并插入）"""
+        timestamp = _ts()
+        self._log_queue.append(f"[{timestamp}] {message}\n")
+        self._schedule_log_flush()
+    
+    def _schedule_log_flush(self):
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after(50, self._flush_log)
+    
+    def _flush_log(self):
+        """将队列中累积的日志一次性插入日志区域"""
+        self._log_flush_scheduled = False
+        lines = []
+        while self._log_queue:
+            lines.append(self._log_queue.popleft())
+        if lines:
+            self._append_log("".join(lines))
+    
+    def _append_log(self, text: str):
+        """向日志区域追加文本（可包含多行），只保留最近的 _LOG_MAX_LINES 行"""
         self.progress_text.config(state='normal')
-        self.progress_text.insert(tk.END, log_entry)
+        self.progress_text.insert(tk.END, text)
+        self._log_lines += text.count('\n')
+        excess = self._log_lines - self._LOG_MAX_LINES
+        if excess >= 50:
+            self.progress_text.delete('1.0', f'{excess + 1}.0')
+            self._log_lines -= excess
         self.progress_text.see(tk.END)
         self.progress_text.config(state='disabled')
     
     def update_recent_menu(self):
-        """更新最近文件菜单"""
-        self.recent_menu.delete(0, tk.END)
+        """更新最近文件菜单（跳过已不存在的文件）"""
+        recent_files = self.config.get('recent_files', [])[:10]  # 最多显示10个
+        existing = self._existing_paths(recent_files)
+        current = tuple((path, path in existing) for path in recent_files)
+        if current == self._last_recent_render and self.recent_menu.index(tk.END) is not None:
+            return
+        self._last_recent_render = current
         
-        recent_files = self.config.get('recent_files', [])
-        if not recent_files:
+        self.recent_menu.delete(0, tk.END)
+        if not existing:
             self.recent_menu.add_command(label="(无最近文件)", state='disabled')
             return
         
-        for file_path in recent_files[:10]:  # 最多显示10个
-            if os.path.exists(file_path):
+        for file_path, exists in current:
+            if exists:
                 filename = os.path.basename(file_path)
                 self.recent_menu.add_command(
                     label=filename,
                     command=lambda path=file_path: self.open_recent_file(path)
                 )
     
+    @staticmethod
+    def _existing_paths(paths: list) -> set:
+        """按所在目录分组检查文件是否存在：同一目录下有多个文件时只 scandir 一次"""
+        by_dir = {}
+        for path in paths:
+            by_dir.setdefault(os.path.dirname(path), []).append(path)
+        
+        existing = set()
+        for directory, dir_paths in by_dir.items():
+            if len(dir_paths) == 1:
+                if os.path.isfile(dir_paths[0]):
+                    existing.add(dir_paths[0])
+                continue
+            try:
+                with os.scandir(directory or '.') as it:
+                    names = {os.path.normcase(entry.name) for entry in it if entry.is_file()}
+            except OSError:
+                continue
+            existing.update(p for p in dir_paths if os.path.normcase(os.path.basename(p)) in names)
+        return existing
+    
     def open_recent_file(self, file_path: str):
         """打开最近文件"""
         if os.path.exists(file_path):
@@ -832,19 +1313,51 @@ class VideoFrameExtractorGUI:
             'default_frame_interval': max(1, interval_val),
             'default_start_time': self.start_time_var.get(),
             'window_geometry': self.root.geometry(),
-            'default_output_format': selected_format
+            'default_output_format': selected_format,
+            'default_quality': int(self.quality_var.get()),
+            'default_webp_lossless': bool(self.webp_lossless_var.get()),
+            'default_webp_method': self.get_selected_webp_method(),
+            'default_png_compress_level': self.get_selected_png_level(),
+            'fast_encode': bool(self.fast_encode_var.get()),
+            'use_nvdec': bool(self.nvdec_var.get())
         })
         save_project_config(self.config)
 
+    def export_settings(self):
+        """将当前设置导出为带缩进的 JSON 文件"""
+        filename = filedialog.asksaveasfilename(
+            title="导出设置",
+            defaultextension=".json",
+            filetypes=[("JSON 文件", "*.json"), ("所有文件", "*.*")],
+            initialfile="settings.json"
+        )
+        if not filename:
+            return
+        self.save_current_config()
+        save_project_config(self.config, filename, pretty=True)
+        self.log_message(f"设置已导出: {filename}")
+
+    def on_output_format_selected(self, event=None):
+        """下拉框选项序号即 OutputFormat 取值"""
+        self._current_fmt = OutputFormat(self.output_format_combo.current())
+
     def get_selected_output_format(self) -> str:
         """获取选中的输出格式（扩展名）"""
-        display = getattr(self, 'output_format_display_var', None)
-        if display is None:
-            return self.config.get('default_output_format', 'webp')
-        display_val = self.output_format_display_var.get()
-        ext = self.output_format_reverse_map.get(display_val, 'webp')
-        # 统一返回 'jpeg' 而非 'jpg'
-        return 'jpeg' if ext == 'jpeg' else ext
+        return self._current_fmt.ext
+    
+    def get_selected_webp_method(self) -> int:
+        """获取选中的 WebP 编码速度（method 0-6）"""
+        try:
+            return self.webp_method_values.index(self.webp_method_var.get())
+        except ValueError:
+            return 4
+    
+    def get_selected_png_level(self) -> int:
+        """获取选中的 PNG 压缩等级（0-9）"""
+        try:
+            return self.png_level_values.index(self.png_level_var.get())
+        except ValueError:
+            return 1
     
     def show_about(self):
         """显示关于对话框"""
@@ -869,8 +1382,9 @@ class VideoFrameExtractorGUI:
             else:
                 return
         
-        # 保存配置
+        # 保存配置（等待后台写盘完成）
         self.save_current_config()
+        flush_project_config()
         
         # 清理资源
         if self.video_processor:
@@ -887,42 +1401,98 @@ class VideoFrameExtractorGUI:
         if not self.video_processor:
             return
         self.preview_worker_stop.clear()
+        # 新线程启动后先解码当前目标位置
+        self._preview_target_changed.set()
         self.preview_worker = threading.Thread(target=self._preview_worker_loop, daemon=True)
         self.preview_worker.start()
+        if self.preview_drain_job is None:
+            self.preview_drain_job = self.root.after(16, self._drain_preview_queue)
 
     def stop_preview_worker(self):
         """停止后台预览线程"""
         try:
             if self.preview_worker:
                 self.preview_worker_stop.set()
+                self._preview_target_changed.set()
                 self.preview_worker.join(timeout=0.5)
+            if self.preview_drain_job is not None:
+                self.root.after_cancel(self.preview_drain_job)
         except Exception:
             pass
         finally:
             self.preview_worker = None
+            self.preview_drain_job = None
+            # 丢弃旧视频尚未显示的帧
+            while True:
+                try:
+                    self._preview_queue.get_nowait()
+                except queue.Empty:
+                    break
 
     def _preview_worker_loop(self):
-        """后台循环：按最新目标秒数拉取帧并在主线程显示"""
+        """后台生产者：只解码最新的目标秒数，结果放入预览队列"""
         last_seconds = None
         while not self.preview_worker_stop.is_set():
+            # 由 set_preview_target / stop_preview_worker 唤醒，空闲时不占用 CPU
+            self._preview_target_changed.wait()
+            if self.preview_worker_stop.is_set():
+                break
             try:
+                with self._preview_target_lock:
+                    seconds = float(self.preview_target_seconds)
+                    self._preview_target_changed.clear()
                 if not self.video_processor:
-                    time.sleep(0.1)
                     continue
-                seconds = float(self.preview_target_seconds)
-                # 避免重复解码同一时间点
+                # 目标未变化（如松开拖动条时的重复设置）时不重复解码同一时间点
                 if last_seconds is not None and abs(seconds - last_seconds) < 1e-3:
-                    time.sleep(0.05)
                     continue
-                frame = self.video_processor.get_frame_at_seconds_fast(seconds)
-                if frame is not None:
-                    last_seconds = seconds
-                    # 在主线程更新画面
-                    self.root.after(0, lambda f=frame: self.display_preview_frame(f))
-                # 控制频率（~20fps 上限，实际取决于解码速度）
-                time.sleep(0.05)
+                fps = self.video_processor.video_info.get('fps', 0) or 25.0
+                frame_idx = int(max(0.0, seconds) * fps)
+                if (frame_idx,) + self._preview_canvas_size in self._photo_cache:
+                    # 已缓存的位置无需解码，由主线程直接取缓存图显示
+                    frame = None
+                    slot = -1
+                else:
+                    # 近期解码过的帧直接从环形缓冲区取出
+                    slot = self._preview_ring_lookup(frame_idx)
+                    if slot < 0:
+                        frame = self.video_processor.get_preview_frame(seconds)
+                        if frame is None:
+                            # 读取失败时等待下一次目标变化，不在同一位置反复重试
+                            last_seconds = seconds
+                            continue
+                        slot = self._preview_ring_store(frame_idx, frame)
+                    if slot >= 0:
+                        frame = self._preview_ring[slot]
+                last_seconds = seconds
+                # 槽位中尚未显示的旧帧直接丢弃，保证主线程拿到的总是最新画面；
+                # 本线程是唯一的生产者，取出旧帧后 put_nowait 不会再遇到队列已满
+                with self._preview_slot_lock:
+                    try:
+                        self._preview_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                    self._preview_queue.put_nowait((frame_idx, frame))
+                    self._preview_queued_slot = slot
             except Exception:
                 time.sleep(0.1)
+
+    def _drain_preview_queue(self):
+        """主线程消费者：约 60Hz 取出槽位中的预览帧并显示（Tk 控件只在主线程访问）"""
+        try:
+            with self._preview_slot_lock:
+                frame_idx, frame = self._preview_queue.get_nowait()
+                # 取出的帧在显示期间仍引用环形缓冲区槽位，解码线程不得覆盖
+                self._preview_shown_slot = self._preview_queued_slot
+                self._preview_queued_slot = -1
+        except queue.Empty:
+            pass
+        else:
+            self.display_preview_frame(frame, frame_idx)
+        if self.preview_worker is not None:
+            self.preview_drain_job = self.root.after(16, self._drain_preview_queue)
+        else:
+            self.preview_drain_job = None
     
     def run(self):
         """运行应用程序"""
@@ -0,0 +1,74 @@
+"""
+预览图像处理内核
+使用 Numba 将缩放与 BGR→RGB 通道交换合并为一次并行遍历，省去中间的全尺寸缓冲区
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba 为可选依赖
+    njit = None
+    prange = range
+
+
+NUMBA_AVAILABLE = njit is not None
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _resize_bgr_to_rgb(src, dst):
+        src_h, src_w = src.shape[0], src.shape[1]
+        dst_h, dst_w = dst.shape[0], dst.shape[1]
+        scale_y = src_h / dst_h
+        scale_x = src_w / dst_w
+        for y in prange(dst_h):
+            # 像素中心对齐的双线性插值
+            fy = (y + 0.5) * scale_y - 0.5
+            if fy < 0.0:
+                fy = 0.0
+            y0 = int(fy)
+            if y0 > src_h - 1:
+                y0 = src_h - 1
+            y1 = min(y0 + 1, src_h - 1)
+            wy = fy - y0
+            for x in range(dst_w):
+                fx = (x + 0.5) * scale_x - 0.5
+                if fx < 0.0:
+                    fx = 0.0
+                x0 = int(fx)
+                if x0 > src_w - 1:
+                    x0 = src_w - 1
+                x1 = min(x0 + 1, src_w - 1)
+                wx = fx - x0
+                for c in range(3):
+                    top = src[y0, x0, c] * (1.0 - wx) + src[y0, x1, c] * wx
+                    bottom = src[y1, x0, c] * (1.0 - wx) + src[y1, x1, c] * wx
+                    # 输出通道顺序反转：B,G,R -> R,G,B
+                    dst[y, x, 2 - c] = np.uint8(top * (1.0 - wy) + bottom * wy + 0.5)
+
+
+def resize_bgr_to_rgb(src: np.ndarray, dst_h: int, dst_w: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    双线性缩放 BGR 图像并同时转换为 RGB
+
+    Args:
+        src: BGR 图像（H, W, 3，uint8）
+        dst_h: 输出高度
+        dst_w: 输出宽度
+        out: 可选的输出缓冲区（dst_h, dst_w, 3，uint8），提供时直接写入以避免分配
+
+    Returns:
+        RGB 图像（dst_h, dst_w, 3，uint8）
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("未安装 numba")
+    dst = out if out is not None else np.empty((dst_h, dst_w, 3), dtype=np.uint8)
+    _resize_bgr_to_rgb(src, dst)
+    return dst
+
+
+def warmup():
+    """预先编译内核（首次编译耗时较长，建议在后台线程调用）"""
+    if NUMBA_AVAILABLE:
+        resize_bgr_to_rgb(np.zeros((4, 4, 3), dtype=np.uint8), 2, 2)
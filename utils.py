@@ -6,26 +6,57 @@
 import os
 import sys
 import json
+import copy
+import queue
+import atexit
 import shutil
-from typing import List, Dict, Any, Optional
+import threading
+import time
+import concurrent.futures
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime
-import cv2
-import numpy as np
-from PIL import Image, ImageTk
-import tkinter as tk
+
+# OpenCV / NumPy / PIL 加载较慢，仅在图像处理函数中按需导入，
+# 使 GUI 读取配置、判断文件类型等轻量操作无需等待这些库加载
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image, ImageTk
+
+
+# 支持的视频扩展名（保持列表顺序用于展示，集合用于快速判断）
+_VIDEO_EXTS_LIST = (
+    '.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv',
+    '.webm', '.m4v', '.3gp', '.mpg', '.mpeg', '.ts'
+)
+_VIDEO_EXTS = frozenset(_VIDEO_EXTS_LIST)
+
+# 输出图片扩展名，模块加载时构建一次，逐文件判断时只做一次集合查找
+_IMG_EXTS_LIST = ('.png', '.webp', '.jpg', '.jpeg')
+_IMG_EXTS = frozenset(_IMG_EXTS_LIST)
 
 
 def get_supported_video_formats() -> List[str]:
     """获取支持的视频格式列表"""
-    return [
-        '.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', 
-        '.webm', '.m4v', '.3gp', '.mpg', '.mpeg', '.ts'
-    ]
+    return list(_VIDEO_EXTS_LIST)
+
+
+def is_video_filename(file_path: str) -> bool:
+    """
+    仅按扩展名判断是否为支持的视频格式（不访问文件系统）
+    
+    Args:
+        file_path: 文件路径
+        
+    Returns:
+        扩展名是否为支持的视频格式
+    """
+    return os.path.splitext(file_path)[1].lower() in _VIDEO_EXTS
 
 
 def is_video_file(file_path: str) -> bool:
     """
-    检查文件是否为支持的视频格式
+    检查文件是否为支持的视频格式（扩展名匹配且文件存在）
     
     Args:
         file_path: 文件路径
@@ -33,11 +64,7 @@ def is_video_file(file_path: str) -> bool:
     Returns:
         是否为视频文件
     """
-    if not os.path.isfile(file_path):
-        return False
-    
-    ext = os.path.splitext(file_path)[1].lower()
-    return ext in get_supported_video_formats()
+    return is_video_filename(file_path) and os.path.isfile(file_path)
 
 
 def get_file_size_mb(file_path: str) -> float:
@@ -74,7 +101,7 @@ def format_file_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} TB"
 
 
-def create_thumbnail(image_path: str, size: tuple = (150, 150)) -> Optional[ImageTk.PhotoImage]:
+def create_thumbnail(image_path: str, size: tuple = (150, 150)) -> Optional['ImageTk.PhotoImage']:
     """
     创建图片缩略图
     
@@ -85,15 +112,21 @@ def create_thumbnail(image_path: str, size: tuple = (150, 150)) -> Optional[Imag
     Returns:
         PIL ImageTk对象，失败返回None
     """
+    # ImageTk 依赖 Tk，按需导入，命令行模式无需加载
+    from PIL import Image, ImageTk
+    
     try:
         with Image.open(image_path) as img:
-            img.thumbnail(size, Image.Resampling.LANCZOS)
+            # JPEG 在解码阶段按 1/2、1/4、1/8 直接缩小（DCT 缩放），其他格式为空操作
+            img.draft('RGB', size)
+            # 150px 级别的缩略图用双线性已看不出差别
+            img.thumbnail(size, Image.Resampling.BILINEAR)
             return ImageTk.PhotoImage(img)
     except Exception:
         return None
 
 
-def opencv_to_pil(cv_image: np.ndarray) -> Image.Image:
+def opencv_to_pil(cv_image: 'np.ndarray') -> 'Image.Image':
     """
     将OpenCV图像转换为PIL图像
     
@@ -103,12 +136,16 @@ def opencv_to_pil(cv_image: np.ndarray) -> Image.Image:
     Returns:
         PIL图像对象
     """
-    # OpenCV使用BGR，PIL使用RGB
-    rgb_image = cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB)
-    return Image.fromarray(rgb_image)
+    import numpy as np
+    from PIL import Image
+    
+    # OpenCV使用BGR，PIL使用RGB：交给 PIL 的 'BGR' 解码器在拷贝时顺带交换通道，
+    # 省去 cvtColor 生成的中间数组
+    height, width = cv_image.shape[:2]
+    return Image.frombuffer('RGB', (width, height), np.ascontiguousarray(cv_image), 'raw', 'BGR', 0, 1)
 
 
-def pil_to_opencv(pil_image: Image.Image) -> np.ndarray:
+def pil_to_opencv(pil_image: 'Image.Image') -> 'np.ndarray':
     """
     将PIL图像转换为OpenCV图像
     
@@ -116,14 +153,15 @@ def pil_to_opencv(pil_image: Image.Image) -> np.ndarray:
         pil_image: PIL图像对象
         
     Returns:
-        OpenCV图像数组
+        OpenCV图像数组（通道反转的只读视图，需要连续内存时请自行 np.ascontiguousarray）
     """
+    import numpy as np
+    
     # PIL使用RGB，OpenCV使用BGR
-    rgb_array = np.array(pil_image)
-    return cv2.cvtColor(rgb_array, cv2.COLOR_RGB2BGR)
+    return np.asarray(pil_image)[:, :, ::-1]
 
 
-def resize_image_for_display(image: np.ndarray, max_width: int = 800, max_height: int = 600) -> np.ndarray:
+def resize_image_for_display(image: 'np.ndarray', max_width: int = 800, max_height: int = 600) -> 'np.ndarray':
     """
     调整图像大小以适应显示
     
@@ -143,26 +181,98 @@ def resize_image_for_display(image: np.ndarray, max_width: int = 800, max_height
     scale = min(scale_w, scale_h, 1.0)  # 不放大图像
     
     if scale < 1.0:
+        import cv2
         new_width = int(width * scale)
         new_height = int(height * scale)
+        if scale < 0.25:
+            # 大幅缩小时先用最近邻逐级减半到目标的 2 倍以内，再做 INTER_AREA，
+            # 避免 INTER_AREA 对全分辨率每个像素做加权求和
+            while image.shape[1] >= new_width * 2 and image.shape[0] >= new_height * 2:
+                image = cv2.resize(image, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_NEAREST)
         return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
     
     return image
 
 
-def save_project_config(config: Dict[str, Any], config_path: str = "config.json"):
+# 配置写盘在后台线程完成：队列中的 (路径, 配置快照) 按路径只写入最新的一份
+_config_writer_queue: "queue.Queue[tuple]" = queue.Queue()
+_config_writer_thread: Optional[threading.Thread] = None
+_config_writer_lock = threading.Lock()
+
+# 最近一次加载/保存的配置：mtime 与磁盘一致时直接返回副本，不再重复解析 JSON；
+# mtime 为 None 表示该快照已提交给后台线程但尚未落盘
+_cfg_cache: Dict[str, Any] = {'path': None, 'mtime': -1, 'data': None}
+_cfg_cache_lock = threading.Lock()
+
+
+def _atomic_write_json(path: str, data: Dict[str, Any], pretty: bool = False):
+    """先写临时文件再 os.replace 替换，写入中途退出也不会留下损坏的配置文件"""
+    # 临时文件名带进程号，多个进程同时保存同一文件时不会写入同一个临时文件
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if pretty:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        else:
+            # 紧凑分隔符：体积更小，序列化更快
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def _config_writer_loop():
+    while True:
+        pending = [_config_writer_queue.get()]
+        # 合并已排队的保存请求，同一文件只写最新的配置
+        while True:
+            try:
+                pending.append(_config_writer_queue.get_nowait())
+            except queue.Empty:
+                break
+        latest = {}
+        for path, config, pretty in pending:
+            latest[path] = (config, pretty)
+        for path, (config, pretty) in latest.items():
+            try:
+                _atomic_write_json(path, config, pretty)
+                mtime = os.stat(path).st_mtime_ns
+            except Exception as e:
+                print(f"保存配置失败: {str(e)}")
+                continue
+            with _cfg_cache_lock:
+                if _cfg_cache['path'] == os.path.abspath(path) and _cfg_cache['data'] is config:
+                    _cfg_cache['mtime'] = mtime
+        for _ in pending:
+            _config_writer_queue.task_done()
+
+
+def flush_project_config():
+    """等待所有排队中的配置写入完成（程序退出前调用）"""
+    if _config_writer_thread is not None:
+        _config_writer_queue.join()
+
+
+def save_project_config(config: Dict[str, Any], config_path: str = "config.json", pretty: bool = False):
     """
     保存项目配置
     
+    配置快照交给后台线程写盘，调用方（通常是 GUI 主线程）不会被磁盘 I/O 阻塞；
+    短时间内的多次保存只写入最后一次
+    
     Args:
         config: 配置字典
         config_path: 配置文件路径
+        pretty: 是否缩进排版（导出供人阅读时使用，默认紧凑格式）
     """
-    try:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        print(f"保存配置失败: {str(e)}")
+    global _config_writer_thread
+    with _config_writer_lock:
+        if _config_writer_thread is None:
+            _config_writer_thread = threading.Thread(target=_config_writer_loop, daemon=True)
+            _config_writer_thread.start()
+            # 解释器退出前写完尚未落盘的配置
+            atexit.register(flush_project_config)
+    snapshot = copy.deepcopy(config)
+    with _cfg_cache_lock:
+        _cfg_cache.update(path=os.path.abspath(config_path), mtime=None, data=snapshot)
+    _config_writer_queue.put((config_path, snapshot, pretty))
 
 
 def load_project_config(config_path: str = "config.json") -> Dict[str, Any]:
@@ -184,22 +294,96 @@ def load_project_config(config_path: str = "config.json") -> Dict[str, Any]:
         'recent_files': []
     }
     
+    abs_path = os.path.abspath(config_path)
     try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
+        mtime = os.stat(abs_path).st_mtime_ns
+    except OSError:
+        mtime = -1
+    with _cfg_cache_lock:
+        if _cfg_cache['path'] == abs_path and _cfg_cache['mtime'] in (None, mtime):
+            return copy.deepcopy(_cfg_cache['data'])
+    
+    try:
+        if mtime != -1:
+            with open(abs_path, 'r', encoding='utf-8') as f:
                 config = json.load(f)
-                # 合并默认配置
-                for key, value in default_config.items():
-                    if key not in config:
-                        config[key] = value
-                return config
+            # 合并默认配置
+            for key, value in default_config.items():
+                if key not in config:
+                    config[key] = value
+            with _cfg_cache_lock:
+                _cfg_cache.update(path=abs_path, mtime=mtime, data=config)
+            return copy.deepcopy(config)
     except Exception as e:
         print(f"加载配置失败: {str(e)}")
     
     return default_config
 
 
-def add_recent_file(file_path: str, config_path: str = "config.json", max_recent: int = 10):
+def get_meta_cache_path() -> str:
+    """获取视频元数据缓存文件路径（~/.cache/vfx/meta.json）"""
+    return os.path.join(os.path.expanduser('~'), '.cache', 'vfx', 'meta.json')
+
+
+def load_meta_cache(cache_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    加载视频元数据缓存
+    
+    Args:
+        cache_path: 缓存文件路径，默认为 get_meta_cache_path()
+        
+    Returns:
+        缓存字典 {键: 视频信息}，读取失败返回空字典
+    """
+    cache_path = cache_path or get_meta_cache_path()
+    try:
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+                if isinstance(cache, dict):
+                    return cache
+    except Exception as e:
+        print(f"加载元数据缓存失败: {str(e)}")
+    return {}
+
+
+def save_meta_cache(cache: Dict[str, Any], cache_path: Optional[str] = None):
+    """
+    保存视频元数据缓存
+    
+    Args:
+        cache: 缓存字典
+        cache_path: 缓存文件路径，默认为 get_meta_cache_path()
+    """
+    cache_path = cache_path or get_meta_cache_path()
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # 多个 CLI 进程可能同时保存，原子替换避免文件被交错写入或截断
+        _atomic_write_json(cache_path, cache)
+    except Exception as e:
+        print(f"保存元数据缓存失败: {str(e)}")
+
+
+def get_meta_cache_key(video_path: str) -> str:
+    """
+    生成视频元数据缓存键：真实路径 + 修改时间 + 文件大小，文件变化后自动失效
+    
+    Args:
+        video_path: 视频文件路径
+        
+    Returns:
+        缓存键字符串
+    """
+    st = os.stat(video_path)
+    return f"{os.path.realpath(video_path)}|{st.st_mtime_ns}|{st.st_size}"
+
+
+# 每个配置文件对应一个最近文件索引：OrderedDict 键为路径，末尾为最新，
+# 移到末尾与淘汰最旧项都是 O(1)
+_recent_files_index: Dict[str, "OrderedDict[str, None]"] = {}
+
+
+def add_recent_file(file_path: str, config_path: str = "config.json", max_recent: int = 10) -> List[str]:
     """
     添加最近使用的文件
     
@@ -207,22 +391,40 @@ def add_recent_file(file_path: str, config_path: str = "config.json", max_recent
         file_path: 文件路径
         config_path: 配置文件路径
         max_recent: 最大最近文件数量
+        
+    Returns:
+        更新后的最近文件列表（最新在前）
     """
     config = load_project_config(config_path)
-    recent_files = config.get('recent_files', [])
-    
-    # 移除已存在的相同路径
-    if file_path in recent_files:
-        recent_files.remove(file_path)
-    
-    # 添加到开头
-    recent_files.insert(0, file_path)
-    
-    # 限制数量
-    recent_files = recent_files[:max_recent]
-    
+    key = os.path.abspath(config_path)
+    recent = _recent_files_index.get(key)
+    if recent is None:
+        # 磁盘上按最新在前的列表保存，载入时反转为最旧在前
+        recent = OrderedDict((path, None) for path in reversed(config.get('recent_files', [])))
+        _recent_files_index[key] = recent
+    
+    recent.pop(file_path, None)
+    recent[file_path] = None
+    while len(recent) > max_recent:
+        recent.popitem(last=False)
+    
+    recent_files = list(reversed(recent))
     config['recent_files'] = recent_files
     save_project_config(config, config_path)
+    return recent_files
+
+
+def _is_image_name(name: str) -> bool:
+    """按扩展名判断是否为输出图片"""
+    return name[name.rfind('.'):].lower() in _IMG_EXTS
+
+
+def _safe_unlink(path: str):
+    """删除文件，忽略已不存在或无法删除的文件"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 def clean_output_directory(output_dir: str, confirm_callback=None) -> bool:
@@ -240,11 +442,9 @@ def clean_output_directory(output_dir: str, confirm_callback=None) -> bool:
         return True
     
     try:
-        # 获取目录中的文件数量（支持多种图片格式）
-        files = [
-            f for f in os.listdir(output_dir)
-            if f.lower().endswith(('.png', '.webp', '.jpg', '.jpeg'))
-        ]
+        # 获取目录中的图片文件（支持多种图片格式）
+        with os.scandir(output_dir) as it:
+            files = [entry.path for entry in it if _is_image_name(entry.name)]
         if not files:
             return True
         
@@ -253,13 +453,16 @@ def clean_output_directory(output_dir: str, confirm_callback=None) -> bool:
             if not confirm_callback(f"目录中有 {len(files)} 个文件，是否清理？"):
                 return False
         
-        # 删除所有图片文件
-        for file in files:
-            file_path = os.path.join(output_dir, file)
-            try:
-                os.remove(file_path)
-            except OSError:
-                pass
+        # 删除所有图片文件：每次 unlink 主要在等待文件系统（Windows 上还有杀毒扫描），
+        # 文件较多时用线程池并发删除
+        if len(files) < 64:
+            for file_path in files:
+                _safe_unlink(file_path)
+        else:
+            max_workers = min(16, (os.cpu_count() or 1) * 2)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for _ in executor.map(_safe_unlink, files):
+                    pass
         
         return True
     except Exception as e:
@@ -267,12 +470,13 @@ def clean_output_directory(output_dir: str, confirm_callback=None) -> bool:
         return False
 
 
-def get_directory_info(directory: str) -> Dict[str, Any]:
+def get_directory_info(directory: str, include_files: bool = True) -> Dict[str, Any]:
     """
     获取目录信息
     
     Args:
         directory: 目录路径
+        include_files: 是否构建 image_files 明细列表（只需数量/大小时传 False）
         
     Returns:
         目录信息字典
@@ -292,30 +496,37 @@ def get_directory_info(directory: str) -> Dict[str, Any]:
     
     try:
         image_files = []
+        file_count = 0
         total_size = 0
+        last_mtime = None
         
-        for file in os.listdir(directory):
-            if file.lower().endswith(('.png', '.webp', '.jpg', '.jpeg')):
-                file_path = os.path.join(directory, file)
-                file_size = os.path.getsize(file_path)
-                file_mtime = os.path.getmtime(file_path)
-                
-                image_files.append({
-                    'name': file,
-                    'path': file_path,
-                    'size': file_size,
-                    'modified': datetime.fromtimestamp(file_mtime)
-                })
-                total_size += file_size
+        # scandir 一次遍历即可拿到文件名与 stat 结果，避免 listdir + getsize + getmtime
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+                if not _is_image_name(name):
+                    continue
+                st = entry.stat()
+                file_count += 1
+                total_size += st.st_size
+                if last_mtime is None or st.st_mtime > last_mtime:
+                    last_mtime = st.st_mtime
+                if include_files:
+                    image_files.append({
+                        'name': name,
+                        'path': entry.path,
+                        'size': st.st_size,
+                        'modified': datetime.fromtimestamp(st.st_mtime)
+                    })
         
         # 按文件名排序
         image_files.sort(key=lambda x: x['name'])
         
         info.update({
-            'file_count': len(image_files),
+            'file_count': file_count,
             'total_size': total_size,
             'image_files': image_files,
-            'last_modified': max([f['modified'] for f in image_files]) if image_files else None
+            'last_modified': datetime.fromtimestamp(last_mtime) if last_mtime is not None else None
         })
         
     except Exception as e:
@@ -324,9 +535,40 @@ def get_directory_info(directory: str) -> Dict[str, Any]:
     return info
 
 
+# 可写性检查缓存：路径 -> (结果, 查询时刻)，输入路径时连续调用不必每次访问文件系统
+_writable_cache: Dict[str, tuple] = {}
+_WRITABLE_CACHE_TTL = 2.0
+
+
+def can_write_to(path: str) -> bool:
+    """
+    判断能否在 path 写入（不存在时检查最近的已存在上级目录），不修改文件系统
+    
+    Args:
+        path: 目录路径
+        
+    Returns:
+        是否可写
+    """
+    now = time.monotonic()
+    cached = _writable_cache.get(path)
+    if cached and now - cached[1] < _WRITABLE_CACHE_TTL:
+        return cached[0]
+    
+    p = os.path.abspath(path) if path else ''
+    while p and not os.path.exists(p):
+        parent = os.path.dirname(p)
+        if parent == p:
+            break
+        p = parent
+    result = bool(p) and os.path.isdir(p) and os.access(p, os.W_OK)
+    _writable_cache[path] = (result, now)
+    return result
+
+
 def validate_output_path(path: str) -> tuple[bool, str]:
     """
-    验证输出路径是否有效
+    验证输出路径是否有效（只检查，不创建目录；创建请调用 ensure_output_dir）
     
     Args:
         path: 路径字符串
@@ -344,15 +586,8 @@ def validate_output_path(path: str) -> tuple[bool, str]:
             return False, f"父目录不存在: {parent_dir}"
         
         # 检查是否可写
-        if os.path.exists(path):
-            if not os.access(path, os.W_OK):
-                return False, "目录不可写"
-        else:
-            # 尝试创建目录
-            try:
-                os.makedirs(path, exist_ok=True)
-            except OSError as e:
-                return False, f"无法创建目录: {str(e)}"
+        if not can_write_to(path):
+            return False, "目录不可写"
         
         return True, ""
         
@@ -360,35 +595,74 @@ def validate_output_path(path: str) -> tuple[bool, str]:
         return False, f"路径验证失败: {str(e)}"
 
 
+def ensure_output_dir(path: str) -> tuple[bool, str]:
+    """
+    创建输出目录（已存在时不做任何操作）
+    
+    Args:
+        path: 目录路径
+        
+    Returns:
+        (是否成功, 错误信息)
+    """
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        return False, f"无法创建目录: {str(e)}"
+    return True, ""
+
+
+# 磁盘可用空间缓存：路径 -> (可用空间GB, 查询时刻)
+_space_cache: Dict[str, tuple] = {}
+_SPACE_CACHE_TTL = 30.0
+
+
 def get_available_space_gb(path: str) -> float:
     """
     获取路径所在磁盘的可用空间（GB）
     
+    结果按路径缓存 30 秒，连续多次提取时无需反复查询文件系统
+    
     Args:
         path: 路径
         
     Returns:
         可用空间（GB）
     """
+    # Windows 上同一盘符下的路径共享一份缓存
+    drive = os.path.splitdrive(os.path.abspath(path))[0]
+    key = drive or path
+    cached = _space_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached[1] < _SPACE_CACHE_TTL:
+        return cached[0]
+    space = _query_available_space_gb(path)
+    if space > 0:
+        _space_cache[key] = (space, now)
+    return space
+
+
+def _query_available_space_gb(path: str) -> float:
+    """查询路径所在磁盘的可用空间（GB），失败返回 0"""
     try:
-        if os.name == 'nt':  # Windows
-            import ctypes
-            free_bytes = ctypes.c_ulonglong(0)
-            ctypes.windll.kernel32.GetDiskFreeSpaceExW(
-                ctypes.c_wchar_p(path),
-                ctypes.pointer(free_bytes),
-                None,
-                None
-            )
-            return free_bytes.value / (1024**3)
-        else:  # Unix/Linux
-            statvfs = os.statvfs(path)
-            return (statvfs.f_frsize * statvfs.f_bavail) / (1024**3)
-    except Exception:
+        return shutil.disk_usage(path).free / (1024**3)
+    except OSError:
         return 0.0
 
 
-def estimate_output_size(total_frames: int, frame_width: int, frame_height: int) -> float:
+# 各输出格式每像素的估算字节数（自然视频画面的经验值）
+BYTES_PER_PIXEL = {
+    'webp': 0.5,
+    'webp_lossless': 1.5,
+    'jpeg': 1.2,
+    'jpg': 1.2,
+    'png': 2.0,
+    'raw': 3.0,
+}
+
+
+def estimate_output_size(total_frames: int, frame_width: int, frame_height: int,
+                         fmt: Optional[str] = None, lossless: bool = False) -> float:
     """
     估算输出文件总大小（MB）
     
@@ -396,15 +670,53 @@ def estimate_output_size(total_frames: int, frame_width: int, frame_height: int)
         total_frames: 总帧数
         frame_width: 帧宽度
         frame_height: 帧高度
+        fmt: 输出格式（'png'/'webp'/'jpeg' 等），默认取配置中的 default_output_format
+        lossless: WebP 是否无损
         
     Returns:
         估算大小（MB）
     """
-    # PNG文件大小估算：每像素约2-4字节（考虑压缩）
-    pixels_per_frame = frame_width * frame_height
-    bytes_per_frame = pixels_per_frame * 3  # 保守估计
-    total_bytes = total_frames * bytes_per_frame
-    return total_bytes / (1024 * 1024)
+    if fmt is None:
+        fmt = load_project_config().get('default_output_format', 'webp')
+    fmt = fmt.lower()
+    if fmt == 'webp' and lossless:
+        fmt = 'webp_lossless'
+    bytes_per_frame = frame_width * frame_height * BYTES_PER_PIXEL.get(fmt, 2.0)
+    return total_frames * bytes_per_frame / (1024 * 1024)
+
+
+def get_available_cpus() -> List[int]:
+    """
+    获取当前进程可用的 CPU 编号列表
+    
+    Returns:
+        CPU 编号列表（不支持亲和性的平台返回空列表）
+    """
+    if not hasattr(os, 'sched_getaffinity'):
+        return []
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except OSError:
+        return []
+
+
+def pin_current_thread(cpus) -> bool:
+    """
+    将当前线程绑定到指定 CPU（仅 Linux 支持）
+    
+    Args:
+        cpus: CPU 编号集合
+        
+    Returns:
+        是否绑定成功
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(threading.get_native_id(), set(cpus))
+        return True
+    except OSError:
+        return False
 
 
 def center_window(window, width: int, height: int):
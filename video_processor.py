@@ -4,17 +4,221 @@
 """
 
 import cv2
+import io
 import os
+import re
+import sys
 import time
 import subprocess
 import shutil
 from datetime import datetime, timedelta
-from typing import Tuple, Optional, Callable
+from typing import Tuple, Optional, Callable, Iterator, List, Dict
 import concurrent.futures
+import multiprocessing
+from multiprocessing import shared_memory
+import queue
+from collections import deque
 import numpy as np
 from PIL import Image
 import threading
-from utils import opencv_to_pil
+from utils import opencv_to_pil, load_meta_cache, save_meta_cache, get_meta_cache_key
+
+try:
+    import decord
+except ImportError:  # decord 为可选依赖
+    decord = None
+
+try:
+    import ffmpegcv
+except ImportError:  # ffmpegcv（NVDEC 硬件解码）为可选依赖
+    ffmpegcv = None
+
+try:
+    import av
+except ImportError:  # PyAV（进程内 FFmpeg 解码）为可选依赖
+    av = None
+
+try:
+    from numba import njit
+except ImportError:  # numba 为可选依赖，缺失时使用纯 Python 实现
+    njit = None
+
+
+# 编码质量预设：fast 面向预览/抽检（有损、最快），balanced 兼顾体积与画质，archive 面向存档（WebP 无损）
+QUALITY_PRESETS = {
+    'fast': {'webp_quality': 80, 'webp_lossless': False, 'webp_method': 0,
+             'jpeg_quality': 85, 'jpeg_420': True, 'png_compress_level': 1},
+    'balanced': {'webp_quality': 90, 'webp_lossless': False, 'webp_method': 4,
+                 'jpeg_quality': 92, 'jpeg_420': False, 'png_compress_level': 3},
+    'archive': {'webp_quality': None, 'webp_lossless': True, 'webp_method': 4,
+                'jpeg_quality': 98, 'jpeg_420': False, 'png_compress_level': 6},
+}
+
+# hwaccel=auto 时的硬件解码优先级（Linux 上 CUDA 优先于 VAAPI）；
+# qsv 无法低成本确认设备存在，不参与自动选择，可通过 hwaccel='qsv' 显式指定
+_HWACCEL_PRIORITY = ('cuda', 'd3d11va', 'dxva2', 'videotoolbox', 'vaapi')
+# NVDEC 支持的编码格式（ffprobe codec_name）
+_NVDEC_CODECS = frozenset({'h264', 'hevc', 'vp8', 'vp9', 'av1', 'mpeg1video', 'mpeg2video', 'mpeg4', 'vc1', 'mjpeg'})
+
+# ffmpeg -hwaccels / -filters 与 nvidia-smi 的探测结果，进程内只探测一次
+_ffmpeg_hwaccels_cache: Optional[frozenset] = None
+_ffmpeg_filters_cache: Optional[frozenset] = None
+_nvidia_compute_cap_cache: Optional[float] = None
+
+
+def _ffmpeg_hwaccels() -> frozenset:
+    """ffmpeg 编译时启用的硬件加速方式（不代表本机有对应设备）"""
+    global _ffmpeg_hwaccels_cache
+    if _ffmpeg_hwaccels_cache is None:
+        names = set()
+        try:
+            proc = subprocess.run(['ffmpeg', '-hide_banner', '-hwaccels'],
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10)
+            lines = proc.stdout.decode(errors='ignore').splitlines()
+            # 首行为 "Hardware acceleration methods:"
+            names = {line.strip() for line in lines[1:] if line.strip()}
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        _ffmpeg_hwaccels_cache = frozenset(names)
+    return _ffmpeg_hwaccels_cache
+
+
+def _ffmpeg_filters() -> frozenset:
+    """ffmpeg 可用的滤镜名（如 scale_cuda 需要编译时启用 CUDA 滤镜）"""
+    global _ffmpeg_filters_cache
+    if _ffmpeg_filters_cache is None:
+        names = set()
+        try:
+            proc = subprocess.run(['ffmpeg', '-hide_banner', '-filters'],
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10)
+            # 每行形如 " T.. scale_cuda  V->V  GPU accelerated video resizer"
+            for line in proc.stdout.decode(errors='ignore').splitlines():
+                parts = line.split()
+                if len(parts) >= 3 and '->' in parts[2]:
+                    names.add(parts[1])
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        _ffmpeg_filters_cache = frozenset(names)
+    return _ffmpeg_filters_cache
+
+
+def _nvidia_compute_cap() -> float:
+    """首块 NVIDIA 显卡的计算能力（如 8.6），无显卡或无法查询时返回 0"""
+    global _nvidia_compute_cap_cache
+    if _nvidia_compute_cap_cache is None:
+        cap = 0.0
+        if shutil.which('nvidia-smi'):
+            try:
+                proc = subprocess.run(['nvidia-smi', '--query-gpu=compute_cap', '--format=csv,noheader'],
+                                      stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10)
+                first = proc.stdout.decode(errors='ignore').strip().splitlines()
+                cap = float(first[0]) if proc.returncode == 0 and first else 0.0
+            except (OSError, subprocess.TimeoutExpired, ValueError):
+                cap = 0.0
+        _nvidia_compute_cap_cache = cap
+    return _nvidia_compute_cap_cache
+
+
+def _hwaccel_device_present(name: str) -> bool:
+    """粗略判断本机是否存在该硬件加速方式所需的设备，避免 ffmpeg 因设备创建失败而直接退出"""
+    if name == 'cuda':
+        return _nvidia_compute_cap() > 0
+    if name in ('d3d11va', 'dxva2'):
+        return os.name == 'nt'
+    if name == 'videotoolbox':
+        return sys.platform == 'darwin'
+    if name == 'vaapi':
+        return sys.platform.startswith('linux') and os.path.exists('/dev/dri/renderD128')
+    return False
+
+
+def _write_bytes(path: str, data) -> None:
+    """
+    将已编码的图像数据一次性写入文件
+    
+    编码在内存中完成，写盘只需一次 open/write/close，避免编码器分块写入带来的多次系统调用
+    
+    Args:
+        path: 目标文件路径
+        data: 已编码的字节数据（bytes 或 memoryview）
+    """
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _image_end(buf: bytearray, start: int, ext: str) -> int:
+    """
+    在连续输出的图像数据流中查找从 start 开始的一幅完整图像的结束位置
+    
+    Args:
+        buf: 数据缓冲区
+        start: 图像起始位置
+        ext: 图像格式（png/jpg/jpeg/webp）
+        
+    Returns:
+        结束位置（不含），数据尚不完整时返回 -1
+    """
+    n = len(buf)
+    if ext == 'png':
+        # 跳过 8 字节签名后逐块前进（长度 + 类型 + 数据 + CRC），直到 IEND 块
+        pos = start + 8
+        while pos + 8 <= n:
+            length = int.from_bytes(buf[pos:pos + 4], 'big')
+            chunk_type = bytes(buf[pos + 4:pos + 8])
+            pos += 12 + length
+            if chunk_type == b'IEND':
+                return pos if pos <= n else -1
+        return -1
+    if ext == 'webp':
+        # RIFF 头中记录了除前 8 字节外的文件长度
+        if start + 8 > n:
+            return -1
+        end = start + 8 + int.from_bytes(buf[start + 4:start + 8], 'little')
+        return end if end <= n else -1
+    # JPEG 以 EOI 标记结尾；熵编码数据中的 0xFF 后都有填充字节，不会误判
+    end = buf.find(b'\xff\xd9', start + 2)
+    return end + 2 if end >= 0 else -1
+
+
+def _frame_to_hmsms(frame_number, fps):
+    """帧号 -> (时, 分, 秒, 毫秒)，毫秒向下取整，与 frames_to_timestamps 一致"""
+    total_ms = int(frame_number * 1000 / fps)
+    return total_ms // 3600000, (total_ms // 60000) % 60, (total_ms // 1000) % 60, total_ms % 1000
+
+
+def _hms_to_frame(hours, minutes, seconds, fps):
+    """(时, 分, 秒) -> 帧号（向下取整）"""
+    return int((hours * 3600 + minutes * 60 + seconds) * fps)
+
+
+if njit is not None:
+    _frame_to_hmsms = njit(cache=True)(_frame_to_hmsms)
+    _hms_to_frame = njit(cache=True)(_hms_to_frame)
+
+
+# 编码子进程内的缓存：共享内存名 -> 已附加的 SharedMemory，编码参数 -> 编码函数
+_worker_shm = {}
+_worker_encoders = {}
+
+
+def _encode_shared_frame(shm_name: str, shape: tuple, encoder_args: tuple, path: str) -> None:
+    """
+    编码子进程任务：从共享内存读取一帧，编码后写入 path
+    
+    Args:
+        shm_name: 帧所在共享内存块的名称
+        shape: 帧形状 (H, W, 3)，uint8
+        encoder_args: 传给 VideoProcessor._build_frame_encoder 的参数
+        path: 输出文件路径
+    """
+    shm = _worker_shm.get(shm_name)
+    if shm is None:
+        # 子进程与父进程共用同一个资源跟踪器，附加时的重复登记不会导致提前释放
+        shm = _worker_shm[shm_name] = shared_memory.SharedMemory(name=shm_name)
+    encode = _worker_encoders.get(encoder_args)
+    if encode is None:
+        encode = _worker_encoders[encoder_args] = VideoProcessor._build_frame_encoder(*encoder_args)
+    _write_bytes(path, encode(np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)))
 
 
 class VideoProcessor:
@@ -30,15 +234,30 @@ class VideoProcessor:
         self.video_path = video_path
         self.cap = None
         self.video_info = {}
+        self._closed = False
         # 预览相关锁，确保跨线程安全读取
         self._cap_lock = threading.Lock()
+        # VideoCapture 当前读取位置（下一次 read 返回的帧号），-1 表示未知，需向 OpenCV 查询
+        self._pos = -1
+        # 视频流编码格式（选择硬件解码时按需探测）
+        self._codec_name: Optional[str] = None
+        # decord 预览读取器（按需创建）
+        self._preview_reader = None
         self._load_video()
     
     def _load_video(self):
         """加载视频文件并获取基本信息"""
         try:
-            self.cap = cv2.VideoCapture(self.video_path)
-            if not self.cap.isOpened():
+            # 优先使用元数据缓存，同一视频重复运行时无需再次探测；
+            # 命中时延迟打开 VideoCapture，FFmpeg/decord 等后端提取时完全不需要它
+            cache_key = get_meta_cache_key(self.video_path)
+            meta_cache = load_meta_cache()
+            cached_info = meta_cache.get(cache_key)
+            if cached_info:
+                self.video_info = dict(cached_info)
+                return
+            
+            if not self._open_capture():
                 raise ValueError(f"无法打开视频文件: {self.video_path}")
             
             # 获取视频基本信息
@@ -54,13 +273,143 @@ class VideoProcessor:
             if self.video_info['fps'] > 0:
                 self.video_info['duration'] = self.video_info['total_frames'] / self.video_info['fps']
             
+            # 探测期间其他进程可能已更新缓存，保存前重新读取再合并，减少条目丢失
+            meta_cache = load_meta_cache()
+            meta_cache[cache_key] = self.video_info
+            save_meta_cache(meta_cache)
+            
         except Exception as e:
             raise ValueError(f"视频加载失败: {str(e)}")
     
+    def _open_capture(self) -> bool:
+        """
+        确保 VideoCapture 已打开（整个生命周期只打开一次，之后复用）
+        
+        Returns:
+            是否可用
+        """
+        if self._closed:
+            return False
+        if self.cap is None:
+            self.cap = self._create_capture(self.video_path)
+            self._pos = 0
+        return self.cap.isOpened()
+    
+    def _cap_position(self) -> int:
+        """当前读取位置：优先使用本地计数，未知时才调用 cap.get（部分后端查询较慢）"""
+        if self._pos < 0:
+            try:
+                self._pos = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            except Exception:
+                return -1
+        return self._pos
+    
+    def _cap_set_position(self, frame_number: int):
+        """定位到指定帧并同步本地计数"""
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        self._pos = frame_number
+    
+    def _cap_grab(self) -> bool:
+        """grab 一帧并推进本地计数；失败时（如到达结尾）位置未知"""
+        ret = self.cap.grab()
+        self._pos = self._pos + 1 if ret and self._pos >= 0 else -1
+        return ret
+    
+    def _cap_read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """read 一帧并推进本地计数"""
+        ret, frame = self.cap.read()
+        self._pos = self._pos + 1 if ret and self._pos >= 0 else -1
+        return ret, frame
+    
+    @staticmethod
+    def _create_capture(video_path: str) -> 'cv2.VideoCapture':
+        """
+        打开 VideoCapture：显式使用 FFmpeg 后端并请求硬件解码（不可用时 OpenCV 自动回退到软件解码），
+        同时把内部缓冲压到 1 帧，减少解码预读占用的内存
+        """
+        cap = None
+        if hasattr(cv2, 'VIDEO_ACCELERATION_ANY'):
+            # OpenCV 4.5.2+ 支持在打开时传入硬件加速参数
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG,
+                                   [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+                                    cv2.CAP_PROP_HW_DEVICE, -1])
+        if cap is None or not cap.isOpened():
+            # 旧版 OpenCV，或未编译 FFmpeg 后端：交给 OpenCV 自行选择后端
+            cap = cv2.VideoCapture(video_path)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+    
+    # 距离小于该帧数的前向定位用 grab 逐帧前进（约两个 GOP），否则使用 cap.set
+    _GRAB_SEEK_LIMIT = 300
+    
+    def _seek_to(self, frame_number: int):
+        """
+        将读取位置定位到指定帧
+        
+        cap.set(CAP_PROP_POS_FRAMES) 会先回退到关键帧再解码到目标帧，部分编码下较慢，
+        且可能返回错位的帧；目标在当前位置之后不远时，直接 grab 前进更快也更准确。
+        
+        Args:
+            frame_number: 目标帧号
+        """
+        current = self._cap_position()
+        
+        distance = frame_number - current
+        if current >= 0 and 0 <= distance < self._GRAB_SEEK_LIMIT:
+            for _ in range(distance):
+                if not self._cap_grab():
+                    break
+        else:
+            self._cap_set_position(frame_number)
+    
     def get_video_info(self) -> dict:
         """获取视频信息"""
         return self.video_info.copy()
     
+    def get_keyframe_times(self) -> np.ndarray:
+        """
+        获取视频流中关键帧的时间（秒，升序）
+        
+        通过 ffprobe 只读取数据包标志，不解码画面；未安装 ffprobe 时改用 PyAV 解复用读取，
+        两者均不可用或读取失败时返回空数组
+        
+        Returns:
+            关键帧时间数组
+        """
+        if shutil.which('ffprobe') is None:
+            return self._keyframe_times_pyav()
+        cmd = [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', self.video_path
+        ]
+        try:
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            return np.empty(0)
+        times = []
+        for line in proc.stdout.decode(errors='ignore').splitlines():
+            pts_time, _, flags = line.partition(',')
+            if 'K' in flags:
+                try:
+                    times.append(float(pts_time))
+                except ValueError:
+                    continue
+        return np.unique(np.asarray(times, dtype=np.float64))
+    
+    def _keyframe_times_pyav(self) -> np.ndarray:
+        """通过 PyAV 解复用读取关键帧时间，只检查数据包的关键帧标志，不解码画面"""
+        if av is None:
+            return np.empty(0)
+        try:
+            with av.open(self.video_path) as container:
+                stream = container.streams.video[0]
+                time_base = float(stream.time_base)
+                times = [packet.pts * time_base for packet in container.demux(stream)
+                         if packet.is_keyframe and packet.pts is not None]
+        except (av.FFmpegError, IndexError):
+            return np.empty(0)
+        return np.unique(np.asarray(times, dtype=np.float64))
+    
     def frame_to_timestamp(self, frame_number: int) -> str:
         """
         将帧号转换为时间戳字符串
@@ -71,19 +420,38 @@ class VideoProcessor:
         Returns:
             格式为 HH-MM-SS-ms 的时间戳字符串
         """
-        if self.video_info['fps'] <= 0:
+        fps = self.video_info['fps']
+        if fps <= 0:
             return "00-00-00-000"
+        return "%02d-%02d-%02d-%03d" % _frame_to_hmsms(int(frame_number), float(fps))
+    
+    def frames_to_timestamps(self, frame_numbers) -> List[str]:
+        """
+        批量将帧号转换为时间戳字符串
         
-        # 计算时间（秒）
-        time_seconds = frame_number / self.video_info['fps']
+        先用 NumPy 一次性算出整数毫秒，再拆分时分秒，避免逐帧的浮点运算链与累积误差
+        
+        Args:
+            frame_numbers: 帧号序列（列表或 NumPy 数组）
+            
+        Returns:
+            格式为 HH-MM-SS-ms 的时间戳字符串列表
+        """
+        idx = np.asarray(frame_numbers, dtype=np.int64)
+        fps = self.video_info['fps']
+        if fps <= 0:
+            return ["00-00-00-000"] * len(idx)
         
-        # 转换为时分秒毫秒
-        hours = int(time_seconds // 3600)
-        minutes = int((time_seconds % 3600) // 60)
-        seconds = int(time_seconds % 60)
-        milliseconds = int((time_seconds % 1) * 1000)
+        # 整数毫秒（向下取整）
+        total_ms = (idx * 1000 / fps).astype(np.int64)
+        hours = total_ms // 3600000
+        minutes = (total_ms // 60000) % 60
+        seconds = (total_ms // 1000) % 60
+        milliseconds = total_ms % 1000
         
-        return f"{hours:02d}-{minutes:02d}-{seconds:02d}-{milliseconds:03d}"
+        # 以 % 对整行元组格式化，比逐字段 f-string 少一层解释器开销
+        return list(map("%02d-%02d-%02d-%03d".__mod__,
+                        zip(hours.tolist(), minutes.tolist(), seconds.tolist(), milliseconds.tolist())))
     
     def timestamp_to_frame(self, timestamp_str: str) -> int:
         """
@@ -105,8 +473,7 @@ class VideoProcessor:
                 minutes = int(time_parts[1])
                 seconds = float(time_parts[2])  # 支持小数秒
                 
-                total_seconds = hours * 3600 + minutes * 60 + seconds
-                frame_number = int(total_seconds * self.video_info['fps'])
+                frame_number = _hms_to_frame(hours, minutes, seconds, float(self.video_info['fps']))
                 
                 return min(frame_number, self.video_info['total_frames'] - 1)
         except (ValueError, IndexError):
@@ -114,6 +481,45 @@ class VideoProcessor:
         
         return 0
     
+    def resolve_backend(self, backend: str = 'auto', keyframes_only: bool = False) -> str:
+        """
+        确定 extract_frames 实际使用的解码后端
+        
+        Args:
+            backend: 请求的后端 auto/pyav/ffmpeg/opencv/decord/nvdec
+            keyframes_only: 是否只提取关键帧（需要 PyAV 或 ffmpeg）
+            
+        Returns:
+            实际使用的后端名称
+        """
+        # 后端选择：优先使用进程内的 PyAV，其次 FFmpeg 子进程（均可硬件解码），否则使用 OpenCV
+        chosen_backend = backend
+        if backend == 'auto':
+            if self._pyav_available():
+                chosen_backend = 'pyav'
+            else:
+                chosen_backend = 'ffmpeg' if self._ffmpeg_available() else 'opencv'
+        elif backend == 'pyav' and not self._pyav_available():
+            # PyAV 为可选依赖，未安装时按 auto 的顺序回退
+            chosen_backend = 'ffmpeg' if self._ffmpeg_available() else 'opencv'
+        elif backend == 'decord' and not self._decord_available():
+            # decord 为可选依赖，未安装时回退到 OpenCV
+            chosen_backend = 'opencv'
+        elif backend == 'nvdec' and not self._nvdec_available():
+            # ffmpegcv 为可选依赖，未安装时回退到 OpenCV
+            chosen_backend = 'opencv'
+        
+        if keyframes_only and not (chosen_backend == 'pyav' or
+                                   (chosen_backend == 'ffmpeg' and self._ffmpeg_available())):
+            # 跳过非关键帧的解码只能由 PyAV 或 ffmpeg 完成
+            if self._pyav_available():
+                chosen_backend = 'pyav'
+            elif self._ffmpeg_available():
+                chosen_backend = 'ffmpeg'
+            else:
+                raise RuntimeError("仅提取关键帧需要安装 PyAV 或 ffmpeg。")
+        return chosen_backend
+    
     def extract_frames(self, 
                       output_dir: str,
                       start_time: str = "00:00:00",
@@ -125,9 +531,18 @@ class VideoProcessor:
                       output_format: str = 'webp',
                       quality: Optional[int] = None,
                       lossless: bool = True,
-                      png_compress_level: int = 9,
+                      png_compress_level: int = 1,
+                      webp_method: int = 4,
                       backend: str = 'auto',
-                      hwaccel: str = 'auto') -> dict:
+                      hwaccel: str = 'auto',
+                      use_grab_skip: bool = True,
+                      save_pool: Optional[concurrent.futures.Executor] = None,
+                      resize: Optional[Tuple[int, int]] = None,
+                      ffmpeg_mux: bool = False,
+                      keyframes_only: bool = False,
+                      use_processes: bool = False,
+                      threadpool_scaling: float = 1.0,
+                      quality_preset: Optional[str] = None) -> dict:
         """
         提取视频帧
         
@@ -137,13 +552,40 @@ class VideoProcessor:
             end_time: 结束时间 (HH:MM:SS)，None表示到视频结尾
             frame_interval: 帧间隔（每隔N帧提取一帧）
             progress_callback: 进度回调函数 callback(current, total, frame_path)
+            webp_method: WebP 编码速度 0-6，越小越快、体积越大
+            use_grab_skip: OpenCV 后端下，被跳过的帧仅 grab 不解码，只对需要保存的帧 retrieve
+            save_pool: 外部传入的写盘线程池；传入时由调用方负责关闭，否则按 use_threading 内部创建
+            backend: 解码后端 auto/pyav/ffmpeg/opencv/decord/nvdec；auto 依次选择 PyAV、FFmpeg、OpenCV，
+                decord/nvdec 不可用时回退到 OpenCV
+            resize: 输出尺寸 (宽, 高)；尽量交给解码器的缩放器完成，避免全分辨率色彩转换后再缩放
+            ffmpeg_mux: 非 FFmpeg 后端解码时，将原始帧经管道交给单个 ffmpeg 进程编码输出
+            keyframes_only: 只提取关键帧（frame_interval 作用于关键帧序列）；需要 PyAV，或 ffmpeg 与 ffprobe（或 PyAV），
+                解码器直接跳过非关键帧（-skip_frame nokey），稀疏采样时解码量大幅减少
+            use_processes: PNG / 无损 WebP 改由多个子进程编码，帧经共享内存传递；
+                仅在 use_threading 且未传入 save_pool 时生效，max_workers 为进程数；
+                在守护进程中运行时（无法创建子进程）自动改用线程池
+            threadpool_scaling: 未指定 max_workers 时，按格式算出的默认编码线程数再乘以该系数
+            quality_preset: 编码质量预设 fast/balanced/archive（见 QUALITY_PRESETS），指定时覆盖
+                quality、lossless、webp_method 与 png_compress_level；需要无损存档时请使用 archive
             
         Returns:
             提取结果统计信息
         """
-        if not self.cap or not self.cap.isOpened():
+        if self._closed or not self.video_info:
             raise ValueError("视频未正确加载")
         
+        jpeg_420 = False
+        if quality_preset:
+            preset = QUALITY_PRESETS.get(quality_preset)
+            if preset is None:
+                raise ValueError(f"未知的质量预设: {quality_preset}")
+            fmt = (output_format or 'webp').lower()
+            if fmt == 'webp':
+                quality, lossless, webp_method = preset['webp_quality'], preset['webp_lossless'], preset['webp_method']
+            elif fmt in ('jpg', 'jpeg'):
+                quality, jpeg_420 = preset['jpeg_quality'], preset['jpeg_420']
+            png_compress_level = preset['png_compress_level']
+        
         # 创建输出目录
         os.makedirs(output_dir, exist_ok=True)
         
@@ -163,13 +605,8 @@ class VideoProcessor:
         
         # 计算需要提取的帧数（先估算，准确进度由保存回调更新）
         total_frames_to_extract = len(range(start_frame, end_frame + 1, frame_interval))
-        extracted_count = 0
-        failed_count = 0
 
-        # 后端选择：优先使用 FFmpeg + 硬件解码（若可用），否则使用 OpenCV
-        chosen_backend = backend
-        if backend == 'auto':
-            chosen_backend = 'ffmpeg' if self._ffmpeg_available() else 'opencv'
+        chosen_backend = self.resolve_backend(backend, keyframes_only)
         
         if chosen_backend == 'ffmpeg':
             return self._extract_frames_ffmpeg(
@@ -182,121 +619,813 @@ class VideoProcessor:
                 quality=quality,
                 lossless=lossless,
                 png_compress_level=png_compress_level,
+                webp_method=webp_method,
+                jpeg_420=jpeg_420,
                 start_frame=start_frame,
                 end_frame=end_frame,
                 total_frames_to_extract=total_frames_to_extract,
-                hwaccel=hwaccel
+                hwaccel=hwaccel,
+                resize=resize,
+                keyframes_only=keyframes_only
             )
         
-        # 设置视频位置到开始帧，之后顺序读取，避免频繁跳帧造成解码不稳定
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        step = max(1, frame_interval)
+        ext = (output_format or 'png').lower()
+        use_pipe = ffmpeg_mux and self._ffmpeg_available()
+        # 守护进程（如 CLI 多视频并行时的 Pool 工作进程）不能再创建子进程，此时回退到线程池
+        use_processes = (use_processes and not use_pipe and use_threading and save_pool is None
+                         and (ext == 'png' or (ext == 'webp' and lossless))
+                         and not multiprocessing.current_process().daemon)
+        # 帧交给线程池异步编码时不能复用解码缓冲区；串行消费（单线程/管道）或先拷入共享内存时复用以免逐帧分配
+        reuse_buffer = use_pipe or use_processes or (save_pool is None and not use_threading)
+        input_rgb = False
+        if chosen_backend == 'pyav':
+            frames = self._iter_frames_pyav(start_frame, end_frame, step, resize, hwaccel, keyframes_only)
+            if keyframes_only:
+                keyframe_nums = self._keyframe_numbers(start_frame, end_frame, step)
+                if keyframe_nums is not None:
+                    total_frames_to_extract = len(keyframe_nums)
+        elif chosen_backend == 'decord':
+            frames = self._iter_frames_decord(start_frame, end_frame, step, resize)
+            input_rgb = True
+        elif chosen_backend == 'nvdec':
+            frames = self._iter_frames_nvdec(start_frame, end_frame, step, resize)
+        else:
+            frames = self._iter_frames_opencv(start_frame, end_frame, step, use_grab_skip, resize,
+                                              reuse_buffer=reuse_buffer)
+        
+        if max_workers is None and save_pool is None and use_threading and not use_pipe:
+            max_workers = self._default_encode_workers(ext, webp_method, threadpool_scaling)
+        encoder_args = (ext, quality, lossless, png_compress_level, input_rgb, webp_method, jpeg_420)
+        encode = self._build_frame_encoder(*encoder_args)
+        
+        # 一次性预计算所有待保存帧的完整输出路径，保存循环内只做字典查找
+        indices = np.arange(start_frame, end_frame + 1, step, dtype=np.int64)
+        prefix = os.path.join(output_dir, '')
+        suffix = '.' + ext
+        frame_paths = {
+            frame_num: prefix + timestamp + suffix
+            for frame_num, timestamp in zip(indices.tolist(), self.frames_to_timestamps(indices))
+        }
         
         start_extract_time = time.time()
+        if use_pipe:
+            extracted_count, failed_count = self._save_frames_ffmpeg_pipe(
+                frames=frames,
+                output_dir=output_dir,
+                ext=ext,
+                frame_paths=frame_paths,
+                codec_args=self._ffmpeg_codec_args(ext, quality, lossless, png_compress_level, webp_method, jpeg_420),
+                input_rgb=input_rgb,
+                progress_callback=progress_callback,
+                total_frames_to_extract=total_frames_to_extract
+            )
+        elif use_processes:
+            extracted_count, failed_count = self._save_frames_processes(
+                frames=frames,
+                frame_paths=frame_paths,
+                frame_path_fallback=lambda n: prefix + self.frame_to_timestamp(n) + suffix,
+                encoder_args=encoder_args,
+                progress_callback=progress_callback,
+                total_frames_to_extract=total_frames_to_extract,
+                max_workers=max_workers
+            )
+        else:
+            extracted_count, failed_count = self._save_frames(
+                frames=frames,
+                output_dir=output_dir,
+                ext=ext,
+                frame_paths=frame_paths,
+                encode=encode,
+                progress_callback=progress_callback,
+                total_frames_to_extract=total_frames_to_extract,
+                use_threading=use_threading,
+                max_workers=max_workers,
+                save_pool=save_pool
+            )
         
-        # 多线程池用于并行写盘，加速保存速度
-        executor = None
-        futures = []
-        progress_counter = 0
+        # 计算提取时间
+        extract_duration = time.time() - start_extract_time
         
-        try:
-            if use_threading:
-                if max_workers is None:
-                    # 保守并发：最多4线程，并尽量留出1个核心给系统，避免整机卡顿
-                    cpu_count = (os.cpu_count() or 4)
-                    max_workers = max(1, min(4, cpu_count - 1))
-                executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        return {
+            'total_frames_to_extract': total_frames_to_extract,
+            'extracted_count': extracted_count,
+            'failed_count': failed_count,
+            'output_directory': output_dir,
+            'extract_duration': extract_duration,
+            'start_frame': start_frame,
+            'end_frame': end_frame,
+            'frame_interval': frame_interval
+        }
+
+    def _save_frames(self,
+                     frames: Iterator[Tuple[int, Optional[np.ndarray]]],
+                     output_dir: str,
+                     ext: str,
+                     frame_paths: Dict[int, str],
+                     encode: Callable,
+                     progress_callback: Optional[Callable],
+                     total_frames_to_extract: int,
+                     use_threading: bool,
+                     max_workers: Optional[int],
+                     save_pool: Optional[concurrent.futures.Executor]) -> Tuple[int, int]:
+        """
+        消费解码得到的 (帧号, 帧) 序列并保存，帧为 None 表示该帧读取失败
+        
+        多线程时为三级流水线：调用线程解码 -> 线程池编码 -> 单独的写盘线程落盘。
+        在途帧数有上限，解码快于编码时会阻塞等待，内存占用不随视频长度增长。
+        帧直接交给编码线程而不拷贝，多线程时 frames 产出的每一帧必须是独立的数组。
+        
+        frame_paths 为预计算的 帧号 -> 输出路径 映射，缺失时按帧号即时计算
+        
+        Returns:
+            (成功数, 失败数)
+        """
+        # 线程间共享的统计，仅由写盘线程（单线程模式下为调用线程）更新
+        stats = {'extracted': 0, 'failed': 0, 'progress': 0}
+        
+        def report(path, ok):
+            if ok:
+                stats['extracted'] += 1
+            else:
+                stats['failed'] += 1
+            stats['progress'] += 1
+            if progress_callback:
+                progress_callback(stats['progress'], total_frames_to_extract, path)
+        
+        prefix = os.path.join(output_dir, '')
+        suffix = '.' + ext
+        
+        def frame_path(frame_num):
+            path = frame_paths.get(frame_num)
+            if path is None:
+                path = prefix + self.frame_to_timestamp(frame_num) + suffix
+            return path
+        
+        executor = save_pool
+        owns_executor = False
+        if executor is None and use_threading:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+            owns_executor = True
+        
+        if executor is None:
+            # 单线程：每帧解码后立即编码（帧数据仍在缓存中，且解码缓冲区下一帧即被覆盖），
+            # 编码结果攒满一批再集中写盘，解码/编码与文件系统调用不再逐帧交替
+            batch = []
             
-            current_frame_num = start_frame
-            while current_frame_num <= end_frame:
-                ret, frame = self.cap.read()
-                if not ret:
-                    # 读取失败，尝试继续下一帧
-                    failed_count += 1
-                    current_frame_num += 1
-                    continue
-                
-                if (current_frame_num - start_frame) % max(1, frame_interval) == 0:
-                    # 生成文件名（按所选格式扩展名）
-                    timestamp = self.frame_to_timestamp(current_frame_num)
-                    ext = (output_format or 'png').lower()
-                    filename = f"{timestamp}.{ext}"
-                    filepath = os.path.join(output_dir, filename)
-                    
-                    def save_and_report(path, img_bgr):
-                        ok = False
+            def flush():
+                for path, data in batch:
+                    ok = False
+                    if data is not None:
                         try:
-                            # 转为 PIL 图像
-                            pil_img = opencv_to_pil(img_bgr)
-                            if ext == 'png':
-                                lvl = max(0, min(9, int(png_compress_level)))
-                                pil_img.save(path, format='PNG', optimize=True, compress_level=lvl)
-                            elif ext in ('jpg', 'jpeg'):
-                                q = max(1, min(100, int(quality or 95)))
-                                pil_img.save(path, format='JPEG', quality=q, subsampling=0, optimize=True)
-                            elif ext == 'webp':
-                                # WebP 可选无损；降低 method 以减少CPU占用，减轻系统卡顿
-                                q = max(1, min(100, int(quality or (100 if lossless else 95))))
-                                pil_img.save(path, format='WEBP', quality=q, lossless=bool(lossless), method=4)
-                            else:
-                                # 未知格式，回退为PNG
-                                pil_img.save(path, format='PNG', optimize=True, compress_level=9)
+                            _write_bytes(path, data)
                             ok = True
                         except Exception as e:
                             print(f"保存帧失败 {os.path.basename(path)}: {str(e)}")
-                        return ok, path
-                    
-                    if executor:
-                        future = executor.submit(save_and_report, filepath, frame.copy())
-                        futures.append(future)
-                    else:
-                        ok, p = save_and_report(filepath, frame)
-                        if ok:
-                            extracted_count += 1
-                            progress_counter += 1
-                            if progress_callback:
-                                progress_callback(progress_counter, total_frames_to_extract, p)
-                        else:
-                            failed_count += 1
-                
-                current_frame_num += 1
+                    report(path, ok)
+                batch.clear()
             
-            # 处理并行保存完成的结果
-            for future in futures:
+            try:
+                for frame_num, frame in frames:
+                    path = frame_path(frame_num)
+                    # 解码失败（frame 为 None）与编码失败一样以 data=None 入批，由 flush 按顺序计入失败并上报进度
+                    data = None
+                    if frame is not None:
+                        try:
+                            data = encode(frame)
+                        except Exception as e:
+                            print(f"保存帧失败 {os.path.basename(path)}: {str(e)}")
+                    batch.append((path, data))
+                    if len(batch) >= 8:
+                        flush()
+                flush()
+            except Exception as e:
+                raise RuntimeError(f"帧提取过程中发生错误: {str(e)}")
+            return stats['extracted'], stats['failed']
+        
+        # 有界队列：限制在途的原始帧与已编码数据数量
+        max_inflight = 64
+        slots = threading.Semaphore(max_inflight)
+        encoded_queue = queue.Queue(maxsize=max_inflight)
+        
+        def encode_task(path, frame):
+            try:
+                data = encode(frame)
+            except Exception as e:
+                print(f"保存帧失败 {os.path.basename(path)}: {str(e)}")
+                data = None
+            finally:
+                slots.release()
+            encoded_queue.put((path, data))
+        
+        def writer_loop():
+            while True:
+                item = encoded_queue.get()
+                if item is None:
+                    break
+                path, data = item
+                ok = False
+                if data is not None:
+                    try:
+                        _write_bytes(path, data)
+                        ok = True
+                    except Exception as e:
+                        print(f"保存帧失败 {os.path.basename(path)}: {str(e)}")
+                report(path, ok)
+        
+        writer = threading.Thread(target=writer_loop, daemon=True)
+        writer.start()
+        # 只保留尚未完成的任务，已完成的从左端弹出，长视频下不会累积所有帧的 Future
+        inflight = deque()
+        try:
+            for frame_num, frame in frames:
+                if frame is None:
+                    # 解码失败直接交给写盘线程，与编码失败一样计入失败并上报进度
+                    encoded_queue.put((frame_path(frame_num), None))
+                    continue
+                slots.acquire()
+                inflight.append(executor.submit(encode_task, frame_path(frame_num), frame))
+                while inflight and inflight[0].done():
+                    inflight.popleft()
+        except Exception as e:
+            raise RuntimeError(f"帧提取过程中发生错误: {str(e)}")
+        finally:
+            # 等待已提交的编码任务完成，再通知写盘线程退出
+            concurrent.futures.wait(inflight)
+            encoded_queue.put(None)
+            writer.join()
+            if owns_executor:
+                executor.shutdown(wait=True)
+        
+        return stats['extracted'], stats['failed']
+
+    @staticmethod
+    def _default_encode_workers(ext: str, webp_method: int, scaling: float = 1.0) -> int:
+        """
+        按输出格式确定默认编码线程数
+        
+        OpenCV 编码器在 C 层编码且释放 GIL，线程数可随核心数扩展（留出 1 个核心给解码线程）；
+        非默认 method 的 WebP 经 PIL 编码，Python 侧开销占比较大，仍保守限制为最多 4 线程
+        """
+        cpu_count = os.cpu_count() or 4
+        if ext == 'webp' and webp_method != 4:
+            base = min(4, cpu_count - 1)
+        else:
+            base = cpu_count - 1
+        return max(1, int(round(base * scaling)))
+
+    @staticmethod
+    def _save_frames_processes(frames: Iterator[Tuple[int, Optional[np.ndarray]]],
+                               frame_paths: Dict[int, str],
+                               frame_path_fallback: Callable[[int], str],
+                               encoder_args: tuple,
+                               progress_callback: Optional[Callable],
+                               total_frames_to_extract: int,
+                               max_workers: Optional[int]) -> Tuple[int, int]:
+        """
+        多进程编码保存：每帧拷入一块空闲的共享内存，子进程按块名附加后编码写盘
+        
+        PNG（zlib）与无损 WebP 编码是纯 CPU 运算，多进程可按核心数线性扩展；
+        共享内存块数为进程数的两倍，全部在途时解码线程阻塞等待，帧数据无需序列化传输；
+        完成的任务由提交循环所在线程回收，统计与空闲块列表只在该线程中读写
+        
+        Returns:
+            (成功数, 失败数)
+        """
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 4) - 1)
+        
+        stats = {'extracted': 0, 'failed': 0, 'progress': 0}
+        blocks = []
+        free_blocks = []
+        # 在途任务：future -> (共享内存块序号, 输出路径)
+        inflight = {}
+        
+        def report(path, ok):
+            if ok:
+                stats['extracted'] += 1
+            else:
+                stats['failed'] += 1
+            stats['progress'] += 1
+            if progress_callback:
+                progress_callback(stats['progress'], total_frames_to_extract, path)
+        
+        def collect(done):
+            for future in done:
+                index, path = inflight.pop(future)
+                free_blocks.append(index)
                 try:
-                    ok, p = future.result()
-                    if ok:
-                        extracted_count += 1
-                    else:
-                        failed_count += 1
-                    progress_counter += 1
-                    if progress_callback:
-                        progress_callback(progress_counter, total_frames_to_extract, p)
+                    future.result()
+                    report(path, True)
                 except Exception as e:
-                    failed_count += 1
+                    print(f"保存帧失败 {os.path.basename(path)}: {str(e)}")
+                    report(path, False)
+        
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            for frame_num, frame in frames:
+                path = frame_paths.get(frame_num) or frame_path_fallback(frame_num)
+                if frame is None:
+                    # 解码失败同样计入失败并上报进度
+                    report(path, False)
+                    continue
+                if not blocks:
+                    # 首帧确定块大小后再分配
+                    for i in range(max_workers * 2):
+                        blocks.append(shared_memory.SharedMemory(create=True, size=frame.nbytes))
+                        free_blocks.append(i)
+                if frame.dtype != np.uint8 or frame.nbytes > blocks[0].size:
+                    report(path, False)
+                    continue
+                # 回收已完成的任务；没有空闲块时等待至少一个完成
+                collect([f for f in inflight if f.done()])
+                if not free_blocks:
+                    done, _ = concurrent.futures.wait(inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    collect(done)
+                index = free_blocks.pop()
+                np.copyto(np.ndarray(frame.shape, dtype=np.uint8, buffer=blocks[index].buf), frame)
+                future = executor.submit(_encode_shared_frame, blocks[index].name, frame.shape, encoder_args, path)
+                inflight[future] = (index, path)
+            collect(concurrent.futures.wait(inflight).done)
+        except Exception as e:
+            raise RuntimeError(f"帧提取过程中发生错误: {str(e)}")
+        finally:
+            executor.shutdown(wait=True)
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        
+        return stats['extracted'], stats['failed']
+
+    def _iter_frames_opencv(self,
+                            start_frame: int,
+                            end_frame: int,
+                            step: int,
+                            use_grab_skip: bool,
+                            resize: Optional[Tuple[int, int]] = None,
+                            reuse_buffer: bool = True) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """
+        OpenCV 顺序读取 [start_frame, end_frame]，按步长产出需要保存的帧
+        
+        指定 resize 时先请求解码后端直接输出目标尺寸（色彩转换与缩放一次完成），
+        后端不支持时再对输出帧做 cv2.resize
+        
+        reuse_buffer 为 True 时解码结果写入同一块预分配缓冲区，避免逐帧分配 H×W×3 的数组，
+        产出的帧在下一次迭代时会被覆盖；为 False 时每帧由 OpenCV 新分配，可直接交给其他线程持有
+        """
+        if not self._open_capture():
+            raise ValueError("视频未正确加载")
+        
+        # 与预览线程共享同一个 VideoCapture，提取期间独占读取
+        with self._cap_lock:
+            # 定位到开始帧，之后顺序读取，避免频繁跳帧造成解码不稳定
+            self._seek_to(start_frame)
+        
+            scaled_by_decoder = False
+            if resize:
+                scaled_by_decoder = (self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, resize[0]) and
+                                     self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, resize[1]))
+        
+            # 复用的解码缓冲区，尺寸不符时 OpenCV 会自动重新分配；不复用时传 None 让每帧新分配
+            buf = None
+            if reuse_buffer:
+                buf = np.empty((self.video_info['height'], self.video_info['width'], 3), dtype=np.uint8)
+        
+            # 最后一个需要保存的帧之后的帧无需再 grab
+            last_kept = start_frame + (end_frame - start_frame) // step * step
+            try:
+                current_frame_num = start_frame
+                while current_frame_num <= last_kept:
+                    keep = (current_frame_num - start_frame) % step == 0
+                    if use_grab_skip:
+                        # 先 grab 取包，仅对需要保存的帧 retrieve 解码，跳过的帧不做色彩转换
+                        ret = self.cap.grab()
+                        frame = None
+                        if ret and keep:
+                            ret, frame = self.cap.retrieve(buf)
+                    else:
+                        ret, frame = self.cap.read(buf)
+                    if reuse_buffer and ret and frame is not None:
+                        buf = frame
+                    if not ret:
+                        # 读取失败，仅对需要保存的帧记为失败，跳过的帧不计入；继续下一帧
+                        if keep:
+                            yield current_frame_num, None
+                    elif keep:
+                        if resize and (frame.shape[1], frame.shape[0]) != tuple(resize):
+                            frame = cv2.resize(frame, tuple(resize), interpolation=cv2.INTER_AREA)
+                        yield current_frame_num, frame
+                    current_frame_num += 1
+            finally:
+                # 循环内直接调用 grab/retrieve/read，不逐帧维护计数；结束后位置交由下次查询确定
+                self._pos = -1
+                if scaled_by_decoder:
+                    # 恢复原始尺寸，避免影响预览读取
+                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.video_info['width'])
+                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.video_info['height'])
+
+    @staticmethod
+    def _pyav_available() -> bool:
+        return av is not None
+
+    @staticmethod
+    def _pyav_hwaccel(hwaccel: str):
+        """
+        PyAV 硬件解码设置
+        
+        hwaccel 为 auto 时按 _HWACCEL_PRIORITY 选择 PyAV 所带 FFmpeg 支持且本机有设备的类型；
+        编码格式或 profile 不受硬件支持时由 PyAV 自动回退到软件解码，解码结果下载到内存
+        
+        Returns:
+            av.codec.hwaccel.HWAccel，不使用硬件解码时返回 None
+        """
+        if not hwaccel or hwaccel == 'none':
+            return None
+        try:
+            from av.codec.hwaccel import HWAccel, hwdevices_available
+        except ImportError:  # PyAV 14 之前不支持硬件解码
+            return None
+        available = set(hwdevices_available())
+        names = _HWACCEL_PRIORITY if hwaccel == 'auto' else (hwaccel,)
+        for name in names:
+            if name in available and (hwaccel != 'auto' or _hwaccel_device_present(name)):
+                return HWAccel(device_type=name, allow_software_fallback=True)
+        return None
+
+    def _iter_frames_pyav(self,
+                          start_frame: int,
+                          end_frame: int,
+                          step: int,
+                          resize: Optional[Tuple[int, int]],
+                          hwaccel: str = 'auto',
+                          keyframes_only: bool = False) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """
+        使用 PyAV 在进程内解码，无需启动 ffmpeg 子进程，解码帧直接转为 NumPy 数组
+        
+        帧号由每帧的 PTS 换算，文件名与帧的实际时间一致；跳过的帧只解码不做色彩转换，
+        指定 resize 时由 swscale 一次完成缩放与色彩转换。keyframes_only 时解码器跳过非关键帧，
+        step 作用于关键帧序列
+        """
+        hw = self._pyav_hwaccel(hwaccel)
+        container = av.open(self.video_path, hwaccel=hw) if hw is not None else av.open(self.video_path)
+        try:
+            stream = container.streams.video[0]
+            # 帧级 + 片级多线程解码
+            stream.thread_type = 'AUTO'
+            if keyframes_only:
+                stream.codec_context.skip_frame = 'NONKEY'
+            fps = self.video_info.get('fps', 0) or float(stream.average_rate or 25)
+            time_base = stream.time_base
+            first_pts = stream.start_time or 0
+            if start_frame > 0:
+                # 定位到开始帧之前最近的关键帧，之后顺序解码
+                container.seek(first_pts + int(start_frame / fps / time_base), stream=stream, backward=True)
             
+            frame_num = start_frame - 1
+            kept = 0
+            for frame in container.decode(stream):
+                if frame.pts is not None:
+                    frame_num = int(round(float((frame.pts - first_pts) * time_base) * fps))
+                else:
+                    # 缺少时间戳时按解码顺序递增
+                    frame_num += 1
+                if frame_num < start_frame:
+                    continue
+                if frame_num > end_frame:
+                    break
+                if keyframes_only:
+                    keep = kept % step == 0
+                    kept += 1
+                else:
+                    keep = (frame_num - start_frame) % step == 0
+                if not keep:
+                    continue
+                if resize:
+                    # 区域插值，与 OpenCV 后端缩小时使用的 INTER_AREA 一致
+                    frame = frame.reformat(width=resize[0], height=resize[1], format='bgr24', interpolation='AREA')
+                    yield frame_num, frame.to_ndarray()
+                else:
+                    yield frame_num, frame.to_ndarray(format='bgr24')
+        finally:
+            container.close()
+
+    @staticmethod
+    def _decord_available() -> bool:
+        return decord is not None
+
+    def _iter_frames_decord(self,
+                            start_frame: int,
+                            end_frame: int,
+                            step: int,
+                            resize: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """使用 decord 按索引批量解码，只解码需要保存的帧（RGB），适合稀疏采样；缩放在解码器内完成"""
+        indices = list(range(start_frame, end_frame + 1, step))
+        width, height = resize if resize else (-1, -1)
+        vr = decord.VideoReader(self.video_path, num_threads=0, width=width, height=height)
+        # 分块取帧，限制单批内存占用（每批 64 帧）
+        for block_start in range(0, len(indices), 64):
+            block = indices[block_start:block_start + 64]
+            batch = vr.get_batch(block).asnumpy()
+            for frame_num, frame in zip(block, batch):
+                yield frame_num, frame
+
+    @staticmethod
+    def _nvdec_available() -> bool:
+        return ffmpegcv is not None
+
+    def _iter_frames_nvdec(self,
+                           start_frame: int,
+                           end_frame: int,
+                           step: int,
+                           resize: Optional[Tuple[int, int]]) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """
+        使用 ffmpegcv 的 NVDEC 硬件解码顺序读取，可在解码阶段完成缩放
+        
+        ffmpegcv 不支持按帧号定位，开始帧之前的帧在 GPU 上解码后直接丢弃
+        """
+        cap = ffmpegcv.VideoCaptureNV(self.video_path, pix_fmt='bgr24', resize=resize)
+        try:
+            current_frame_num = 0
+            while current_frame_num <= end_frame:
+                ret, frame = cap.read()
+                if not ret:
+                    # 硬件解码流结束或出错，其余帧记为失败
+                    for frame_num in range(max(current_frame_num, start_frame), end_frame + 1):
+                        if (frame_num - start_frame) % step == 0:
+                            yield frame_num, None
+                    break
+                if current_frame_num >= start_frame and (current_frame_num - start_frame) % step == 0:
+                    yield current_frame_num, frame
+                current_frame_num += 1
+        finally:
+            cap.release()
+
+    @staticmethod
+    def _build_frame_encoder(ext: str,
+                             quality: Optional[int],
+                             lossless: bool,
+                             png_compress_level: int,
+                             input_rgb: bool = False,
+                             webp_method: int = 4,
+                             jpeg_420: bool = False) -> Callable:
+        """
+        构造单帧编码函数 encode(img) -> 已编码的字节数据（使用 OpenCV 原生编码器）
+        
+        Args:
+            ext: 输出扩展名（png/jpg/jpeg/webp）
+            quality: JPEG/WebP 质量
+            lossless: WebP 是否无损
+            png_compress_level: PNG 压缩等级
+            input_rgb: 输入帧是否已是 RGB 排列（如 decord 解码结果），否则按 OpenCV 的 BGR 处理
+            webp_method: WebP 编码速度 0-6
+            jpeg_420: JPEG 使用 4:2:0 色度抽样（更快、更小），否则为 4:4:4
+        """
+        method = max(0, min(6, int(webp_method)))
+        
+        # 格式相关的参数在构造时一次算好，返回的编码函数内不再做分支与取值范围检查
+        if ext == 'webp' and method != 4:
+            # OpenCV 的 WebP 编码器与 libwebp 的简易接口都不支持设置 method，非默认 method 时仍经 PIL 编码；
+            # PIL 直接把图像内存交给 libwebp，包装开销相对编码本身可以忽略
+            q = max(1, min(100, int(quality or (100 if lossless else 95))))
+            save_kwargs = {'format': 'WEBP', 'quality': q, 'lossless': bool(lossless), 'method': method}
+            to_pil = Image.fromarray if input_rgb else opencv_to_pil
+            
+            def encode_pil(img):
+                buf = io.BytesIO()
+                to_pil(img).save(buf, **save_kwargs)
+                return buf.getbuffer()
+            
+            return encode_pil
+        
+        if ext == 'png':
+            lvl = max(0, min(9, int(png_compress_level)))
+            params = [cv2.IMWRITE_PNG_COMPRESSION, lvl]
+            if lvl == 1:
+                # 1 级使用 zlib 的 Huffman-only 策略，跳过 LZ77 匹配，编码速度约为默认的数倍
+                params += [cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_HUFFMAN_ONLY]
+            cv_ext = '.png'
+        elif ext in ('jpg', 'jpeg'):
+            q = max(1, min(100, int(quality or 95)))
+            params = [cv2.IMWRITE_JPEG_QUALITY, q, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+            # OpenCV 默认即为 4:2:0；否则与原 PIL 编码一致，不做色度抽样（4:4:4）
+            if not jpeg_420 and hasattr(cv2, 'IMWRITE_JPEG_SAMPLING_FACTOR'):
+                params += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_444]
+            cv_ext = '.jpg'
+        elif ext == 'webp':
+            # OpenCV 约定质量大于 100 即为无损
+            q = 101 if lossless else max(1, min(100, int(quality or 95)))
+            params = [cv2.IMWRITE_WEBP_QUALITY, q]
+            cv_ext = '.webp'
+        else:
+            # 未知格式，回退为PNG
+            params = [cv2.IMWRITE_PNG_COMPRESSION, 9]
+            cv_ext = '.png'
+        imencode = cv2.imencode
+        
+        def encode(img):
+            # OpenCV 原生编码器直接接受 BGR，无需转为 PIL 图像；编码期间释放 GIL，多线程可并行
+            ok, buf = imencode(cv_ext, img, params)
+            if not ok:
+                raise RuntimeError(f"图像编码失败: {ext}")
+            return buf
+        
+        def encode_rgb(img):
+            return encode(cv2.cvtColor(img, cv2.COLOR_RGB2BGR))
+        
+        return encode_rgb if input_rgb else encode
+
+    @staticmethod
+    def _ffmpeg_codec_args(ext: str,
+                           quality: Optional[int],
+                           lossless: bool,
+                           png_compress_level: int,
+                           webp_method: int = 4,
+                           jpeg_420: bool = False) -> List[str]:
+        """根据输出格式生成 ffmpeg 图像编码参数"""
+        if ext == 'png':
+            return ['-c:v', 'png', '-compression_level', str(max(0, min(9, int(png_compress_level))))]
+        if ext in ('jpg', 'jpeg'):
+            # mjpeg 的 q 值越小越高质（2≈高质量，31 最差），将 1-100 的质量映射到该区间
+            if quality:
+                q = int(round(31 - (max(1, min(100, int(quality))) - 1) * 29 / 99))
+            else:
+                q = 2
+            args = ['-c:v', 'mjpeg', '-q:v', str(q)]
+            if jpeg_420:
+                args += ['-pix_fmt', 'yuvj420p']
+            return args
+        if ext == 'webp':
+            args = ['-c:v', 'libwebp']
+            # libwebp 的 compression_level 即 method
+            method = str(max(0, min(6, int(webp_method))))
+            if lossless:
+                args += ['-lossless', '1']
+                args += ['-compression_level', method]
+                args += ['-q:v', str(int(quality or 100))]
+            else:
+                args += ['-lossless', '0']
+                args += ['-compression_level', method]
+                args += ['-q:v', str(max(1, min(100, int(quality or 95))))]
+            return args
+        # 回退为PNG
+        return ['-c:v', 'png', '-compression_level', '9']
+
+    def _save_frames_ffmpeg_pipe(self,
+                                 frames: Iterator[Tuple[int, Optional[np.ndarray]]],
+                                 output_dir: str,
+                                 ext: str,
+                                 frame_paths: Dict[int, str],
+                                 codec_args: List[str],
+                                 input_rgb: bool,
+                                 progress_callback: Optional[Callable],
+                                 total_frames_to_extract: int) -> Tuple[int, int]:
+        """
+        将解码得到的原始帧通过管道交给单个 ffmpeg 进程编码输出（image2），完成后按帧号重命名
+        
+        省去逐帧的 Python 编码与文件打开开销，编码使用 ffmpeg 自带的 SIMD 优化实现
+        
+        Returns:
+            (成功数, 失败数)
+        """
+        if not self._ffmpeg_available():
+            raise RuntimeError("未检测到 ffmpeg，请安装后重试或关闭 ffmpeg 管道输出。")
+        
+        tmp_dir = os.path.join(output_dir, "_ffmpeg_tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        pattern = os.path.join(tmp_dir, "%010d." + ext)
+        
+        proc = None
+        written = []  # 按写入顺序记录帧号，ffmpeg 输出从 0 开始顺序编号
+        failed_count = 0
+        try:
+            for frame_num, frame in frames:
+                if frame is None:
+                    failed_count += 1
+                    continue
+                if proc is None:
+                    # 首帧确定输入尺寸后再启动 ffmpeg
+                    height, width = frame.shape[:2]
+                    cmd = [
+                        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                        '-f', 'rawvideo', '-pix_fmt', 'rgb24' if input_rgb else 'bgr24',
+                        '-s', f"{width}x{height}", '-i', '-',
+                        '-vsync', '0'
+                    ] + codec_args + ['-start_number', '0', '-y', '-f', 'image2', pattern]
+                    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+                                            bufsize=width * height * 3 * 8)
+                proc.stdin.write(np.ascontiguousarray(frame).data)
+                written.append(frame_num)
+        except BrokenPipeError:
+            pass
         except Exception as e:
+            if proc:
+                proc.kill()
             raise RuntimeError(f"帧提取过程中发生错误: {str(e)}")
         finally:
-            if executor:
-                executor.shutdown(wait=True)
+            if proc:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
         
-        # 计算提取时间
-        extract_duration = time.time() - start_extract_time
+        if proc:
+            err = proc.stderr.read()
+            if proc.wait() != 0:
+                raise RuntimeError(f"FFmpeg 编码失败: {err.decode(errors='ignore')}")
         
-        return {
-            'total_frames_to_extract': total_frames_to_extract,
-            'extracted_count': extracted_count,
-            'failed_count': failed_count,
-            'output_directory': output_dir,
-            'extract_duration': extract_duration,
-            'start_frame': start_frame,
-            'end_frame': end_frame,
-            'frame_interval': frame_interval
-        }
+        # 输出序号 i 对应第 i 个写入的帧；扫描实际生成的文件（无需排序），并行重命名为时间戳文件名
+        prefix = os.path.join(output_dir, '')
+        suffix = '.' + ext
+        renames = []
+        with os.scandir(tmp_dir) as it:
+            for entry in it:
+                stem = entry.name[:-len(suffix)]
+                if not entry.name.endswith(suffix) or not stem.isdigit() or int(stem) >= len(written):
+                    continue
+                frame_num = written[int(stem)]
+                dst = frame_paths.get(frame_num)
+                if dst is None:
+                    dst = prefix + self.frame_to_timestamp(frame_num) + suffix
+                renames.append((entry.path, dst))
+        # 写入了但 ffmpeg 未输出的帧记为失败
+        failed_count += len(written) - len(renames)
+        
+        extracted_count = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            # os.replace 期间释放 GIL，多个重命名可同时排队到文件系统
+            futures = {pool.submit(os.replace, src, dst): dst for src, dst in renames}
+            for future in concurrent.futures.as_completed(futures):
+                if future.exception() is not None:
+                    failed_count += 1
+                    continue
+                extracted_count += 1
+                if progress_callback:
+                    progress_callback(extracted_count, total_frames_to_extract, futures[future])
+        
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return extracted_count, failed_count
 
     @staticmethod
     def _ffmpeg_available() -> bool:
         return shutil.which('ffmpeg') is not None
+    
+    def _video_codec(self) -> str:
+        """视频流编码格式（ffprobe codec_name），读取失败返回空字符串"""
+        if self._codec_name is None:
+            self._codec_name = ''
+            if shutil.which('ffprobe'):
+                cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                       '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', self.video_path]
+                try:
+                    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=30)
+                    self._codec_name = proc.stdout.decode(errors='ignore').strip().split(',')[0]
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+        return self._codec_name
+    
+    def _select_hwaccel(self, hwaccel: str) -> List[str]:
+        """
+        生成 ffmpeg 硬件解码参数
+        
+        hwaccel 为 auto 时不再交给 ffmpeg 的 -hwaccel auto（可能选中慢或异常的实现），而是按
+        _HWACCEL_PRIORITY 在 ffmpeg 已编译且本机有设备的方式中选择；选中 CUDA 时解码结果留在显存
+        （-hwaccel_output_format cuda），由滤镜链再下载。AV1 在 Ampere 之前的显卡上没有 NVDEC 支持，
+        此时跳过 CUDA。均不可用时使用软件解码。
+        
+        Args:
+            hwaccel: 'auto'、'none' 或具体的 ffmpeg hwaccel 名称
+            
+        Returns:
+            放在 -i 之前的参数列表
+        """
+        if not hwaccel or hwaccel == 'none':
+            return []
+        if hwaccel != 'auto':
+            return ['-hwaccel', hwaccel]
+        
+        available = _ffmpeg_hwaccels()
+        for name in _HWACCEL_PRIORITY:
+            if name not in available or not _hwaccel_device_present(name):
+                continue
+            if name == 'cuda':
+                codec = self._video_codec()
+                if codec not in _NVDEC_CODECS:
+                    continue
+                if codec == 'av1' and _nvidia_compute_cap() < 8.0:
+                    continue
+                return ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+            return ['-hwaccel', name]
+        return []
+
+    def _keyframe_numbers(self, start_frame: int, end_frame: int, step: int) -> Optional[List[int]]:
+        """[start_frame, end_frame] 内每隔 step 个关键帧取一个的帧号列表，无法读取关键帧信息时返回 None"""
+        keyframe_times = self.get_keyframe_times()
+        if len(keyframe_times) == 0:
+            return None
+        fps = self.video_info.get('fps', 0) or 25.0
+        keyframe_nums = np.round(keyframe_times * fps).astype(np.int64)
+        in_range = keyframe_nums[(keyframe_nums >= start_frame) & (keyframe_nums <= end_frame)]
+        return in_range[::step].tolist()
 
     def _extract_frames_ffmpeg(self,
                                output_dir: str,
@@ -308,28 +1437,43 @@ class VideoProcessor:
                                quality: Optional[int],
                                lossless: bool,
                                png_compress_level: int,
+                               webp_method: int,
+                               jpeg_420: bool,
                                start_frame: int,
                                end_frame: int,
                                total_frames_to_extract: int,
-                               hwaccel: str) -> dict:
+                               hwaccel: str,
+                               resize: Optional[Tuple[int, int]] = None,
+                               keyframes_only: bool = False) -> dict:
         if not self._ffmpeg_available():
             raise RuntimeError("未检测到 ffmpeg，请安装后重试或使用 OpenCV 后端。")
         
+        step = max(1, frame_interval)
+        # ffmpeg 按输出顺序从 0 开始编号，out_frames[i] 为第 i 个输出文件对应的源帧号
+        if keyframes_only:
+            out_frames = self._keyframe_numbers(start_frame, end_frame, step)
+            if out_frames is None:
+                raise RuntimeError("无法读取关键帧信息，仅提取关键帧需要安装 ffprobe 或 PyAV。")
+            total_frames_to_extract = len(out_frames)
+        else:
+            out_frames = list(range(start_frame, end_frame + 1, step))
+        
         ext = (output_format or 'webp').lower()
-        tmp_dir = os.path.join(output_dir, "_ffmpeg_tmp")
-        os.makedirs(tmp_dir, exist_ok=True)
-        pattern = os.path.join(tmp_dir, "%010d." + ext)
+        
+        hw_args = self._select_hwaccel(hwaccel)
+        # 解码帧是否留在显存：为真时滤镜链先在显存中选帧（与缩放），再下载到内存交给图像编码器
+        gpu_frames = 'cuda' in hw_args[2:]
         
         # 构建 ffmpeg 命令
         cmd = [
             'ffmpeg', '-hide_banner', '-loglevel', 'error',
         ]
-        # 硬件解码选择
-        if hwaccel and hwaccel != 'auto':
-            cmd += ['-hwaccel', hwaccel]
-        else:
-            # Windows 上优先尝试 dxva2（更通用），否则让 ffmpeg 自动选择
-            cmd += ['-hwaccel', 'auto']
+        hw_pos = len(cmd)
+        cmd += hw_args
+        
+        if keyframes_only:
+            # 解码器只解码关键帧，非关键帧连解码都省去
+            cmd += ['-skip_frame', 'nokey']
         
         # 起止时间
         if start_time:
@@ -339,72 +1483,37 @@ class VideoProcessor:
         
         cmd += ['-i', self.video_path]
         
-        # 帧选择：每隔 N 帧提取一帧
-        select_filter = f"select=not(mod(n\\,{max(1, frame_interval)}))"
-        vf = [select_filter]
-        
-        cmd += ['-vf', ','.join(vf), '-vsync', 'vfr']
+        # 仅关键帧时逐帧透传时间戳，避免按帧率补帧/丢帧
+        cmd += ['-vf', self._ffmpeg_filter_chain(step, resize, gpu_frames),
+                '-vsync', '0' if keyframes_only else 'vfr']
         
         # 输出编码设置
-        if ext == 'png':
-            cmd += ['-c:v', 'png', '-compression_level', str(max(0, min(9, int(png_compress_level))))]
-        elif ext in ('jpg', 'jpeg'):
-            q = max(2, min(31, int(quality or 2)))  # mjpeg 的 q 值越小越高质，2≈高质量
-            cmd += ['-c:v', 'mjpeg', '-q:v', str(q)]
-        elif ext == 'webp':
-            cmd += ['-c:v', 'libwebp']
-            if lossless:
-                cmd += ['-lossless', '1']
-                # 适度压缩强度，降低CPU
-                cmd += ['-compression_level', '4']
-                cmd += ['-q:v', str(int(quality or 100))]
-            else:
-                cmd += ['-lossless', '0']
-                cmd += ['-compression_level', '4']
-                cmd += ['-q:v', str(max(1, min(100, int(quality or 95))))]
-        else:
-            # 回退为PNG
-            cmd += ['-c:v', 'png', '-compression_level', '9']
+        cmd += self._ffmpeg_codec_args(ext, quality, lossless, png_compress_level, webp_method, jpeg_420)
         
-        # 起始编号，从起始帧号开始编号，便于后续按帧号重命名为时间戳
-        cmd += ['-start_number', str(start_frame)]
+        # 编码结果经 stdout 连续输出，由本进程拆分后直接写入最终文件名，省去临时目录与逐帧重命名
+        cmd += ['-f', 'image2pipe', '-']
         
-        # 输出模式与路径
-        cmd += ['-y', '-f', 'image2', pattern]
+        # 第 index 个输出图像对应 out_frames[index]，完整路径一次性批量算出（前缀直接拼接，不逐个 join）
+        prefix = os.path.join(output_dir, '')
+        suffix = '.' + ext
+        out_paths = [prefix + name + suffix for name in self.frames_to_timestamps(out_frames)]
+        out_path = out_paths.__getitem__
         
         start_time_extract = time.time()
         
         # 运行 ffmpeg
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if proc.returncode != 0:
-            err = proc.stderr.decode(errors='ignore')
-            raise RuntimeError(f"FFmpeg 提取失败: {err}")
-        
-        # 统计与重命名
-        files = sorted([f for f in os.listdir(tmp_dir) if f.lower().endswith('.' + ext)])
-        extracted_count = 0
-        failed_count = 0
-        progress_counter = 0
-        for fname in files:
-            try:
-                index = int(os.path.splitext(fname)[0])
-                timestamp = self.frame_to_timestamp(index)
-                new_name = f"{timestamp}.{ext}"
-                src = os.path.join(tmp_dir, fname)
-                dst = os.path.join(output_dir, new_name)
-                os.replace(src, dst)
-                extracted_count += 1
-                progress_counter += 1
-                if progress_callback:
-                    progress_callback(progress_counter, total_frames_to_extract, dst)
-            except Exception:
-                failed_count += 1
-        
-        # 清理临时目录
-        try:
-            shutil.rmtree(tmp_dir, ignore_errors=True)
-        except Exception:
-            pass
+        extracted_count, failed_count, returncode, err = self._run_ffmpeg_image_pipe(
+            cmd, ext, len(out_frames), out_path, progress_callback, total_frames_to_extract)
+        if returncode != 0 and hw_args and extracted_count + failed_count == 0:
+            # 硬件解码失败（如 10bit 或不支持的 profile 回退到软件解码后无法 hwdownload），
+            # 尚未输出任何帧时改用软件解码重试一次
+            cmd = cmd[:hw_pos] + cmd[hw_pos + len(hw_args):]
+            if gpu_frames:
+                cmd[cmd.index('-vf') + 1] = self._ffmpeg_filter_chain(step, resize, False)
+            extracted_count, failed_count, returncode, err = self._run_ffmpeg_image_pipe(
+                cmd, ext, len(out_frames), out_path, progress_callback, total_frames_to_extract)
+        if returncode != 0:
+            raise RuntimeError(f"FFmpeg 提取失败: {err.decode(errors='ignore')}")
         
         extract_duration = time.time() - start_time_extract
         return {
@@ -418,6 +1527,96 @@ class VideoProcessor:
             'frame_interval': frame_interval
         }
     
+    @staticmethod
+    def _ffmpeg_filter_chain(step: int, resize: Optional[Tuple[int, int]], gpu_frames: bool) -> str:
+        """
+        构建帧选择 / 缩放滤镜链
+        
+        解码帧留在显存时，select 只按帧号放行、不读取像素，直接作用于 CUDA 帧；
+        缩放优先用 scale_cuda 在显存中完成，最后只把保留下来的帧 hwdownload 到内存交给图像编码器
+        """
+        # 帧选择：每隔 N 帧提取一帧
+        vf = [f"select=not(mod(n\\,{step}))"]
+        scaled = False
+        if gpu_frames:
+            if resize and 'scale_cuda' in _ffmpeg_filters():
+                vf.append(f"scale_cuda={resize[0]}:{resize[1]}:format=nv12")
+                scaled = True
+            vf.append('hwdownload,format=nv12')
+        if resize and not scaled:
+            # 在 ffmpeg 的 swscale 中一次完成色彩转换与缩放
+            vf.append(f"scale={resize[0]}:{resize[1]}")
+        return ','.join(vf)
+    
+    @staticmethod
+    def _run_ffmpeg_image_pipe(cmd: List[str],
+                               ext: str,
+                               max_images: int,
+                               out_path: Callable[[int], str],
+                               progress_callback: Optional[Callable],
+                               total_frames_to_extract: int) -> Tuple[int, int, int, bytes]:
+        """
+        运行以 image2pipe 输出到 stdout 的 ffmpeg，按图像边界拆分数据流并写入 out_path(序号)
+        
+        写盘交给小线程池，与读取管道、ffmpeg 编码重叠；超出 max_images 的多余图像记为失败
+        
+        Returns:
+            (成功数, 失败数, ffmpeg 返回码, stderr 内容)
+        """
+        split_ext = ext if ext in ('jpg', 'jpeg', 'webp') else 'png'
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # stderr 在单独线程中读取，避免错误输出较多时管道写满导致双方互相等待
+        err_chunks = []
+        err_reader = threading.Thread(target=lambda: err_chunks.append(proc.stderr.read()), daemon=True)
+        err_reader.start()
+        
+        stats = {'extracted': 0, 'failed': 0}
+        inflight = deque()
+        
+        def finish_oldest():
+            path, future = inflight.popleft()
+            try:
+                future.result()
+                stats['extracted'] += 1
+            except OSError as e:
+                print(f"保存帧失败 {os.path.basename(path)}: {str(e)}")
+                stats['failed'] += 1
+                return
+            if progress_callback:
+                progress_callback(stats['extracted'], total_frames_to_extract, path)
+        
+        buf = bytearray()
+        index = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            try:
+                while True:
+                    chunk = proc.stdout.read1(1 << 20)
+                    if not chunk:
+                        break
+                    buf += chunk
+                    start = 0
+                    while True:
+                        end = _image_end(buf, start, split_ext)
+                        if end < 0:
+                            break
+                        if index < max_images:
+                            path = out_path(index)
+                            inflight.append((path, pool.submit(_write_bytes, path, bytes(buf[start:end]))))
+                            if len(inflight) > 32:
+                                finish_oldest()
+                        else:
+                            stats['failed'] += 1
+                        index += 1
+                        start = end
+                    del buf[:start]
+            finally:
+                proc.stdout.close()
+                returncode = proc.wait()
+                err_reader.join()
+                while inflight:
+                    finish_oldest()
+        return stats['extracted'], stats['failed'], returncode, b''.join(err_chunks)
+    
     def get_frame_at_time(self, timestamp: str) -> Optional[np.ndarray]:
         """
         获取指定时间的帧
@@ -428,13 +1627,13 @@ class VideoProcessor:
         Returns:
             帧图像数组，失败返回None
         """
-        if not self.cap or not self.cap.isOpened():
+        if not self._open_capture():
             return None
 
         frame_num = self.timestamp_to_frame(timestamp)
         with self._cap_lock:
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = self.cap.read()
+            self._cap_set_position(frame_num)
+            ret, frame = self._cap_read()
         return frame if ret else None
     
     def get_frame_at_position(self, frame_number: int) -> Optional[np.ndarray]:
@@ -447,15 +1646,15 @@ class VideoProcessor:
         Returns:
             帧图像数组，失败返回None
         """
-        if not self.cap or not self.cap.isOpened():
+        if not self._open_capture():
             return None
         
         if frame_number < 0 or frame_number >= self.video_info['total_frames']:
             return None
         
         with self._cap_lock:
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            ret, frame = self.cap.read()
+            self._cap_set_position(frame_number)
+            ret, frame = self._cap_read()
         return frame if ret else None
 
     def get_frame_at_seconds_fast(self, seconds: float) -> Optional[np.ndarray]:
@@ -468,16 +1667,15 @@ class VideoProcessor:
 
         该方法用于预览线程，提升连续拖动的跟手性。
         """
-        if not self.cap or not self.cap.isOpened():
+        if not self._open_capture():
             return None
 
         fps = self.video_info.get('fps', 0) or 25.0
         target_frame = int(max(0.0, seconds) * fps)
 
         with self._cap_lock:
-            try:
-                current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-            except Exception:
+            current_frame = self._cap_position()
+            if current_frame < 0:
                 current_frame = target_frame
 
             diff = target_frame - current_frame
@@ -488,17 +1686,48 @@ class VideoProcessor:
                 # 前进到目标位置：先抓取到倒数第二帧，再 read 最后一帧
                 steps = max(0, diff - 1)
                 for _ in range(steps):
-                    self.cap.grab()
-                ret, frame = self.cap.read()
+                    self._cap_grab()
+                ret, frame = self._cap_read()
                 return frame if ret else None
             else:
                 # 大幅跳转或后退：直接定位
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
-                ret, frame = self.cap.read()
+                self._cap_set_position(target_frame)
+                ret, frame = self._cap_read()
                 return frame if ret else None
     
+    def get_preview_frame(self, seconds: float) -> Optional[np.ndarray]:
+        """
+        获取预览帧（BGR）
+        
+        安装了 decord 时按帧索引精确定位解码，无需像 VideoCapture 那样每次跳转都从关键帧回退；
+        decord 不可用或读取失败时回退到 get_frame_at_seconds_fast
+        
+        Args:
+            seconds: 预览时间（秒）
+            
+        Returns:
+            帧图像，失败返回 None
+        """
+        if self._closed:
+            return None
+        if decord is not None:
+            try:
+                if self._preview_reader is None:
+                    self._preview_reader = decord.VideoReader(self.video_path, ctx=decord.cpu(0), num_threads=0)
+                vr = self._preview_reader
+                fps = self.video_info.get('fps', 0) or 25.0
+                frame_idx = min(int(max(0.0, seconds) * fps), len(vr) - 1)
+                frame = vr.get_batch([frame_idx]).asnumpy()[0]
+                # decord 输出 RGB，预览显示链路统一使用 BGR
+                return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            except Exception:
+                pass
+        return self.get_frame_at_seconds_fast(seconds)
+    
     def close(self):
         """关闭视频文件"""
+        self._closed = True
+        self._preview_reader = None
         if self.cap:
             self.cap.release()
             self.cap = None
@@ -552,6 +1781,10 @@ def format_duration(seconds: float) -> str:
         return f"{minutes:02d}:{secs:02d}"
 
 
+# HH:MM:SS（也接受 - 分隔与小数秒），小时 0-23，分秒 0-59
+_TIME_RE = re.compile(r'^([01]?\d|2[0-3])[:-]([0-5]?\d)[:-]([0-5]?\d(?:\.\d*)?)$')
+
+
 def validate_time_format(time_str: str) -> bool:
     """
     验证时间格式是否正确
@@ -562,20 +1795,5 @@ def validate_time_format(time_str: str) -> bool:
     Returns:
         是否为有效格式
     """
-    try:
-        # 支持 HH:MM:SS 和 HH-MM-SS 格式
-        time_str = time_str.replace('-', ':')
-        parts = time_str.split(':')
-        
-        if len(parts) != 3:
-            return False
-        
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds = float(parts[2])
-        
-        return (0 <= hours <= 23 and 
-                0 <= minutes <= 59 and 
-                0 <= seconds < 60)
-    except (ValueError, IndexError):
-        return False
+    # 支持 HH:MM:SS 和 HH-MM-SS 格式，正则在模块加载时预编译
+    return _TIME_RE.match(time_str) is not None